@@ -1,149 +1,650 @@
-
-import pathlib
-import chess
-import chess.engine
-
-
-class ChessEngine:
-
-    def __init__(self, stockfish_path="stockfish/stockfish.exe", depth=20):
-        path = pathlib.Path(stockfish_path)
-        if not path.is_file():
-            raise FileNotFoundError(f"Stockfish binary not found at {path}")
-        self.stockfish_path = str(path)
-        self.depth = depth
-
-
-    def _open(self):
-        """Return a running SimpleEngine; caller must close()."""
-        return chess.engine.SimpleEngine.popen_uci(self.stockfish_path)
-
-
-    def get_best_moves(self, fen: str, top_n: int = 3):
-        board = chess.Board(fen)
-        engine = self._open()
-        info = engine.analyse(board, chess.engine.Limit(depth=self.depth),
-                              multipv=top_n)
-        engine.quit()
-
-        best = []
-        for entry in info:
-            move = entry["pv"][0]
-            score = entry["score"].relative.score()
-            best.append((board.san(move) if move in board.legal_moves else move.uci(),
-                         score))
-        return best
-
-    def board_to_fen(self, board_2d, turn="W", castling="KQkq",
-                     en_passant="-", halfmove="0", fullmove="1"):
-        piece_map = {
-            "RookW": "R", "KnightW": "N", "BishopW": "B",
-            "QueenW": "Q", "KingW": "K", "PownW": "P",
-            "RookB": "r", "KnightB": "n", "BishopB": "b",
-            "QueenB": "q", "KingB": "k", "PownB": "p"
-        }
-
-        if all(all(cell is None for cell in row) for row in board_2d):
-            return "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
-
-        fen_rows = []
-        for row in board_2d:
-            run, fen_row = 0, ""
-            for cell in row:
-                if cell is None:
-                    run += 1
-                else:
-                    if run:
-                        fen_row += str(run)
-                        run = 0
-                    fen_row += piece_map.get(cell, "?")
-            if run:
-                fen_row += str(run)
-            fen_rows.append(fen_row)
-
-        board_part = "/".join(fen_rows[::-1])
-        return f"{board_part} {'w' if turn == 'W' else 'b'} {castling} {en_passant} {halfmove} {fullmove}"
-
-    def evaluate_position(self, fen: str):
-        engine = self._open()
-        board = chess.Board(fen)
-        info = engine.analyse(board, chess.engine.Limit(depth=self.depth))
-        engine.quit()
-
-        score = info["score"].relative
-        if score.is_mate():
-            moves = abs(score.mate())
-            winner = "White" if score.mate() > 0 else "Black"
-            return f"{winner} mates in {moves}"
-        return f"Evaluation: {score.score() / 100:.2f}"
-
-    def set_fen(self, board_2d, fen: str):
-        """
-        In-place update of your 8×8 list-of-lists `board_2d`
-        to match *fen*.
-
-        board_2d comes from ChessBoard.board and contains either None or
-        string codes like 'RookW', 'PownB', ...
-        """
-        piece_rev = {
-            'R': 'RookW',   'N': 'KnightW', 'B': 'BishopW',
-            'Q': 'QueenW',  'K': 'KingW',   'P': 'PownW',
-            'r': 'RookB',   'n': 'KnightB', 'b': 'BishopB',
-            'q': 'QueenB',  'k': 'KingB',   'p': 'PownB'
-        }
-
-        rows = fen.split()[0].split('/')
-        if len(rows) != 8:
-            raise ValueError("Bad FEN for set_fen")
-
-        for r in range(8):
-            for c in range(8):
-                board_2d[r][c] = None
-
-        for fen_r, row_str in enumerate(rows):
-            board_r = 7 - fen_r         
-            col = 0
-            for ch in row_str:
-                if ch.isdigit():
-                    col += int(ch)
-                else:
-                    board_2d[board_r][col] = piece_rev.get(ch, None)
-                    col += 1
-
-    def evaluate_move(self, fen: str, move_uci: str):
-        engine = self._open()
-        board = chess.Board(fen)
-
-        before = engine.analyse(board, chess.engine.Limit(depth=self.depth))
-        score_before = before["score"].relative.score()
-
-        move = chess.Move.from_uci(move_uci)
-        if move not in board.legal_moves:
-            engine.quit()
-            return f"Illegal move: {move_uci}"
-
-        board.push(move)    
-        after = engine.analyse(board, chess.engine.Limit(depth=self.depth))
-        engine.quit()
-
-        score_after = after["score"].relative.score()
-        diff = score_after - score_before
-
-        best_reply = self.get_best_moves(board.fen(), 1)[0][0]
-        verdict = ("Great move! 👍"   if diff >  50 else
-                   "Good move! ✅"    if diff >   0 else
-                   "Inaccuracy 🤔"    if diff > -50 else
-                   "Mistake ❌"       if diff > -200 else
-                   "Blunder 🚨")
-
-        return (f"{board.san(move)} ({move_uci})\n"
-                f"Δ = {diff:+} cp\n"
-                f"Best reply: {best_reply}\n"
-                f"{verdict}")
-
-    @staticmethod
-    def tuple_to_uci(move_tuple):
-        """((row, col), (row, col))  ->  \"e2e4\" (0-based rows/cols)."""
-        def sq(r, c):
-            return chess.square(c, 7 - r)
-        return chess.square_name(sq(*move_tuple[0])) + chess.square_name(sq(*move_tuple[1]))
+
+import asyncio
+import atexit
+import contextlib
+import pathlib
+import threading
+import time
+import chess
+import chess.engine
+from analysis_cache import AnalysisCache, ANALYSIS_DB, position_key
+from opening_book import OpeningBook, OPENING_BOOK
+from tablebase import Tablebase, SYZYGY_DIR
+
+
+_loop      = None
+_loop_lock = threading.Lock()
+
+# strength -> (UCI options, depth cap, node cap) for the engine opponent.
+# The weak levels are capped in nodes too, so they answer almost for free.
+STRENGTHS = {
+    "Easy":   ({"Skill Level": 3,  "UCI_LimitStrength": True, "UCI_Elo": 1400}, 6,    20_000),
+    "Medium": ({"Skill Level": 10, "UCI_LimitStrength": True, "UCI_Elo": 2000}, 12,   300_000),
+    "Hard":   ({"Skill Level": 20}, None, None),
+}
+# centipawn-loss ceilings of the move tags, checked in order
+TAG_LIMITS = (("good", 50), ("inaccuracy", 100), ("mistake", 200))
+VERDICTS   = {"best": "Great move! 👍", "good": "Good move! ✅", "inaccuracy": "Inaccuracy 🤔",
+              "mistake": "Mistake ❌", "blunder": "Blunder 🚨"}
+
+
+def move_tag(loss, best=False):
+    """'best', 'good', 'inaccuracy', 'mistake' or 'blunder' for a move losing *loss* cp."""
+    if best:
+        return "best"
+    for tag, limit in TAG_LIMITS:
+        if loss < limit:
+            return tag
+    return "blunder"
+
+
+MIN_THINK = 0.05                # seconds, even with the flag about to fall
+MAX_THINK = 30.0                # seconds, even in an hour-long game
+
+
+def think_time(remaining, increment=0.0, ply=0):
+    """
+    Seconds the bot may spend on its next move: an even share of the clock
+    over the moves still expected, plus most of the increment, and never
+    more than a quarter of what is left or MAX_THINK.
+    """
+    moves_to_go = max(20, 40 - ply // 2)
+    budget = remaining / moves_to_go + 0.8 * increment
+    return max(MIN_THINK, min(budget, remaining / 4, MAX_THINK))
+
+
+def engine_loop():
+    """
+    The event loop every pooled engine talks through.  It runs in a daemon
+    thread, so warm engines never keep the app alive after the window closes.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="engine-loop", daemon=True).start()
+        return _loop
+
+
+class EnginePool:
+    """
+    Warm Stockfish processes shared by every ChessEngine that uses the same
+    binary and settings, so a query pays for the search only and the hash
+    table survives between queries.
+
+    checkout() hands out an idle process (spawning up to *size* of them) and
+    checkin() gives it back.  A process that crashed or stopped answering is
+    thrown away on checkin and a fresh one is spawned on the next checkout.
+    """
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path, size=2, threads=1, hash_mb=64):
+        self.path    = path
+        self.size    = size
+        self.options = {"Threads": threads, "Hash": hash_mb}
+        self.spawned = 0            # processes started so far, respawns included
+        self._idle   = []
+        self._alive  = 0            # idle + checked out
+        self._cond   = threading.Condition()
+
+    @classmethod
+    def shared(cls, path, size=2, threads=1, hash_mb=64):
+        key = (path, size, threads, hash_mb)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(path, size, threads, hash_mb)
+            return cls._shared[key]
+
+    @classmethod
+    def close_all(cls):
+        with cls._shared_lock:
+            pools, cls._shared = list(cls._shared.values()), {}
+        for pool in pools:
+            pool.close()
+
+    def checkout(self, timeout=None):
+        """A running SimpleEngine; give it back with checkin()."""
+        dead = []
+        try:
+            with self._cond:
+                while True:
+                    while self._idle:
+                        engine = self._idle.pop()
+                        if self._running(engine):
+                            return engine
+                        self._alive -= 1
+                        dead.append(engine)
+                    if self._alive < self.size:
+                        self._alive += 1
+                        break
+                    if not self._cond.wait(timeout):
+                        raise TimeoutError("no engine process became free")
+        finally:
+            for engine in dead:                # shut down outside the lock
+                self._discard(engine)
+        try:
+            return self._spawn()
+        except Exception:
+            with self._cond:
+                self._alive -= 1
+                self._cond.notify()
+            raise
+
+    async def checkout_async(self):
+        """checkout() for coroutines on the engine loop; the wait happens on a worker thread."""
+        pending = asyncio.get_running_loop().run_in_executor(None, self.checkout)
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # the worker still gets an engine in the end; hand it straight back
+            pending.add_done_callback(
+                lambda done: done.cancelled() or done.exception() or self.checkin(done.result()))
+            raise
+
+    def checkin(self, engine, broken=False):
+        """Safe on the engine loop: a dead or broken process is shut down without blocking."""
+        with self._cond:
+            broken = broken or not self._running(engine)
+            if broken:
+                self._alive -= 1
+            else:
+                self._idle.append(engine)
+            self._cond.notify()
+        if broken:
+            self._discard(engine)
+
+    @contextlib.contextmanager
+    def engine(self, timeout=None):
+        """with pool.engine() as eng: ...  -- checkout/checkin around a block."""
+        engine = self.checkout(timeout)
+        broken = False
+        try:
+            yield engine
+        except (chess.engine.EngineError, chess.engine.EngineTerminatedError, TimeoutError):
+            broken = True
+            raise
+        finally:
+            self.checkin(engine, broken)
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._alive -= len(idle)
+        for engine in idle:
+            self._discard(engine)
+
+    def _spawn(self):
+        transport, protocol = asyncio.run_coroutine_threadsafe(
+            chess.engine.popen_uci(self.path if isinstance(self.path, str) else list(self.path)),
+            engine_loop()).result()
+        engine = chess.engine.SimpleEngine(transport, protocol)
+        try:
+            engine.configure({name: value for name, value in self.options.items()
+                              if name in engine.options})
+        except Exception:
+            self._discard(engine)
+            raise
+        self.spawned += 1
+        return engine
+
+    @staticmethod
+    def _running(engine):
+        return not engine.protocol.returncode.done()
+
+    @staticmethod
+    def _discard(engine):
+        """
+        Shut *engine* down.  SimpleEngine.quit() waits on the engine loop,
+        so on that loop itself the quit is only scheduled; a process that
+        already died just has its transport closed.
+        """
+        if not EnginePool._running(engine):
+            engine.close()
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is engine.protocol.loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            engine.protocol.loop.create_task(EnginePool._quit(engine))
+            return
+        try:
+            engine.quit()
+        except Exception:
+            engine.close()
+
+    @staticmethod
+    async def _quit(engine):
+        try:
+            await asyncio.wait_for(engine.protocol.quit(), engine.timeout)
+        except Exception:
+            engine.close()
+
+
+atexit.register(EnginePool.close_all)
+
+
+class EngineOpponent:
+    """
+    The engine side of one game.  It keeps one pooled process for the
+    whole game so that, after answering, the engine goes on searching the
+    reply its PV expects on the player's time (UCI pondering).  If the
+    player makes that move, a ponderhit answers almost at once; any other
+    move stops the ponder search and a fresh one starts.
+    """
+
+    def __init__(self, pool, strength="Hard", ponder=True, book=None, tablebase=None):
+        self.pool      = pool
+        self.strength  = strength
+        self.ponder    = ponder
+        self.book      = book
+        self.tablebase = tablebase
+        self._engine  = None
+        self._board   = None        # the position after our last move, with its history
+
+    def play_async(self, board, remaining, increment=0.0):
+        """
+        Future for the engine's chess.Move, searched for as long as
+        think_time() allows with *remaining* seconds on its clock.
+        """
+        fen = board if isinstance(board, str) else board.fen()
+        options, depth, nodes = STRENGTHS[self.strength]
+        limit = chess.engine.Limit(time=think_time(remaining, increment, chess.Board(fen).ply()),
+                                   depth=depth, nodes=nodes)
+        return asyncio.run_coroutine_threadsafe(self._play(fen, limit, options), engine_loop())
+
+    def close(self):
+        """Stop pondering and hand the process back to the pool, at full strength."""
+        async def release():
+            engine, self._engine = self._engine, None
+            self._board = None
+            if engine is None:
+                return
+            try:
+                await self._restore(engine)
+                self.pool.checkin(engine)
+            except (chess.engine.EngineError, chess.engine.EngineTerminatedError):
+                self.pool.checkin(engine, broken=True)
+
+        asyncio.run_coroutine_threadsafe(release(), engine_loop())
+
+    async def _restore(self, engine):
+        """
+        Leave the process as the pool handed it out.  A one-ply search
+        outside this game ends the ponder search (python-chess stops it and
+        waits for its bestmove, it cannot be a ponderhit), turns Ponder off,
+        drops the options play(options=...) set and makes the next user
+        start a new game.  configure() then pins the strength options at
+        their defaults, so analysis never searches at Skill Level 3.
+        """
+        protocol = engine.protocol
+        await protocol.play(chess.Board(), chess.engine.Limit(depth=1), ponder=False)
+        options, _, _ = STRENGTHS[self.strength]
+        await protocol.configure({name: protocol.options[name].default
+                                  for name in options if name in protocol.options})
+
+    def _continue(self, fen):
+        """
+        A board for *fen* that carries on from our last move, so
+        python-chess can tell the player's move is the one being pondered.
+        """
+        target = position_key(chess.Board(fen))
+        if self._board is not None:
+            for move in self._board.legal_moves:
+                self._board.push(move)
+                if position_key(self._board) == target:
+                    return self._board.copy()
+                self._board.pop()
+        return chess.Board(fen)
+
+    async def _play(self, fen, limit, options):
+        board = self._continue(fen)
+        # book moves are picked by weight so the bot varies its openings,
+        # endgames in the tablebase are played perfectly; neither searches
+        move = self.book.move(board, weighted=True) if self.book else None
+        if move is None and self.tablebase:
+            lines = self.tablebase.probe(board)
+            move = lines[0]["pv"][0] if lines else None
+        if move:
+            board.push(move)
+            self._board = board
+            return move
+
+        if self._engine is None:
+            self._engine = await self.pool.checkout_async()
+        try:
+            # the options stay set for the whole game; close() restores the defaults
+            supported = {k: v for k, v in options.items() if k in self._engine.protocol.options}
+            result = await self._engine.protocol.play(board, limit, ponder=self.ponder,
+                                                      game=self, options=supported)
+        except (chess.engine.EngineError, chess.engine.EngineTerminatedError):
+            engine, self._engine, self._board = self._engine, None, None
+            self.pool.checkin(engine, broken=True)
+            raise
+        if result.move:
+            board.push(result.move)
+            self._board = board
+        return result.move
+
+
+class ChessEngine:
+
+    def __init__(self, stockfish_path="stockfish/stockfish.exe", depth=20,
+                 pool_size=2, threads=1, hash_mb=64, cache_path=ANALYSIS_DB,
+                 book_path=OPENING_BOOK, syzygy_path=SYZYGY_DIR):
+        # a path, or a command list such as [sys.executable, "fake_engine.py"]
+        command = [stockfish_path] if isinstance(stockfish_path, (str, pathlib.Path)) else stockfish_path
+        path = pathlib.Path(command[0])
+        if not path.is_file():
+            raise FileNotFoundError(f"Stockfish binary not found at {path}")
+        self.stockfish_path = str(path) if len(command) == 1 else tuple(map(str, command))
+        self.depth = depth
+        self.pool  = EnginePool.shared(self.stockfish_path, pool_size, threads, hash_mb)
+        self.cache = AnalysisCache.shared(cache_path) if cache_path else None
+        self.book  = OpeningBook.shared(book_path) if book_path else None
+        self.tablebase = Tablebase.shared(syzygy_path) if syzygy_path else None
+
+
+    def _session(self, work):
+        """work(engine) on one pooled process, retried once if that process died."""
+        try:
+            with self.pool.engine() as engine:
+                return work(engine)
+        except chess.engine.EngineTerminatedError:
+            with self.pool.engine() as engine:
+                return work(engine)
+
+    def _lookup(self, board, depth, multipv):
+        """Lines for *board* without a search: exact from the tablebase, else cached."""
+        lines = self.tablebase.probe(board, multipv) if self.tablebase else None
+        if lines is None and self.cache:
+            lines = self.cache.get(board, depth, multipv)
+        return lines
+
+    def _search_all(self, requests):
+        """
+        [(board, multipv), ...] -> the lines for each, taken from the
+        tablebase or the analysis cache where possible and from one engine
+        session otherwise.
+        """
+        depth = self.depth
+        results = [self._lookup(board, depth, n) for board, n in requests]
+
+        def work(engine):
+            limit = chess.engine.Limit(depth=depth)
+            for i, (board, n) in enumerate(requests):
+                if results[i] is None:          # a retry resumes where it stopped
+                    results[i] = engine.analyse(board, limit, multipv=n)
+                    if self.cache:
+                        self.cache.put(board, depth, n, results[i])
+
+        if None in results:
+            self._session(work)
+        return results
+
+    def _analyse(self, board, multipv=None):
+        lines = self._search_all([(board, multipv or 1)])[0]
+        return lines if multipv else lines[0]
+
+    def known(self, board, multipv=None):
+        """What _analyse() would return when no search is needed for it, else None."""
+        lines = self._lookup(board, self.depth, multipv or 1)
+        return lines if lines is None or multipv else lines[0]
+
+    def analyse_many(self, boards, multipv=None):
+        """_analyse() for every board, the ones not known already in one engine session."""
+        results = self._search_all([(board, multipv or 1) for board in boards])
+        return results if multipv else [lines[0] for lines in results]
+
+    # ── asyncio API ───────────────────────────────────────────────
+    # Both methods return a concurrent.futures.Future right away.  Threads
+    # call .result(), asyncio code awaits asyncio.wrap_future(future), and
+    # future.cancel() stops the search in the engine so that nothing keeps
+    # burning CPU after the page that asked for it is gone.  *timeout* is a
+    # deadline in seconds: the engine then answers with its best line so far.
+
+    def analyse_async(self, board, multipv=None, depth=None, timeout=None):
+        """Future for what _analyse() returns: one info dict, or a list with *multipv*."""
+        board = chess.Board(board) if isinstance(board, str) else board.copy()
+        return asyncio.run_coroutine_threadsafe(
+            self._analyse_coro(board, multipv, depth or self.depth, timeout), engine_loop())
+
+    def best_move_async(self, board, depth=None, timeout=None):
+        """Future for the engine's chess.Move, None when the game is over."""
+        board = chess.Board(board) if isinstance(board, str) else board.copy()
+
+        async def best():
+            info = await self._analyse_coro(board, None, depth or self.depth, timeout)
+            pv = info.get("pv")
+            return pv[0] if pv else None
+
+        return asyncio.run_coroutine_threadsafe(best(), engine_loop())
+
+    def stream_async(self, board, on_info, depth=None, interval=0.1):
+        """
+        Progressive deepening: one search to *depth* that hands each new
+        depth to on_info(info) as it arrives -- the first line at once, then
+        at most every *interval* seconds, and the final line always.  The
+        Future resolves to the final info; cancel it to pre-empt the search.
+        on_info runs on the engine loop thread, so it must be quick.
+        """
+        board = chess.Board(board) if isinstance(board, str) else board.copy()
+        return asyncio.run_coroutine_threadsafe(
+            self._stream_coro(board, on_info, depth or self.depth, interval), engine_loop())
+
+    async def _stream_coro(self, board, on_info, depth, interval):
+        lines = self._lookup(board, depth, 1)
+        if lines:
+            on_info(lines[0])
+            return lines[0]
+
+        engine = await self.pool.checkout_async()
+        broken, shown = False, 0.0
+        try:
+            with await engine.protocol.analysis(board, chess.engine.Limit(depth=depth)) as analysis:
+                async for info in analysis:
+                    # skip currmove/nps chatter, only complete lines are worth drawing
+                    if "score" not in info or not info.get("pv"):
+                        continue
+                    now = time.monotonic()
+                    if now - shown >= interval:
+                        shown = now
+                        on_info(analysis.info)
+            final = dict(analysis.info)
+        except (chess.engine.EngineError, chess.engine.EngineTerminatedError):
+            broken = True
+            raise
+        finally:
+            self.pool.checkin(engine, broken)
+
+        if "score" not in final:                    # game over, nothing was searched
+            return final
+        on_info(final)
+        if self.cache and final.get("depth", depth) >= depth:
+            self.cache.put(board, depth, 1, [final])
+        return final
+
+    def opponent(self, strength="Hard", ponder=True):
+        """An EngineOpponent at *strength* that plays from this engine's pool."""
+        return EngineOpponent(self.pool, strength, ponder, self.book, self.tablebase)
+
+    async def _analyse_coro(self, board, multipv, depth, timeout):
+        n = multipv or 1
+        lines = self._lookup(board, depth, n)
+        if lines is None:
+            engine = await self.pool.checkout_async()
+            broken = False
+            try:
+                limit = chess.engine.Limit(depth=depth, time=timeout)
+                lines = await engine.protocol.analyse(board, limit, multipv=n)
+            except (chess.engine.EngineError, chess.engine.EngineTerminatedError):
+                broken = True
+                raise
+            finally:
+                # a cancelled search is stopped by python-chess, the process stays usable
+                self.pool.checkin(engine, broken)
+            # only searches that reached full depth before the deadline are cached
+            if self.cache and lines[0].get("depth", depth) >= depth:
+                self.cache.put(board, depth, n, lines)
+        return lines if multipv else lines[0]
+
+
+    def get_best_moves(self, fen: str, top_n: int = 3):
+        """
+        [(san, centipawns), ...] best first.  In the opening book the
+        heaviest book moves come back instead, scored None, with no search.
+        """
+        board = chess.Board(fen)
+        book = self.book.moves(board)[:top_n] if self.book else []
+        if book:
+            return [(board.san(move), None) for move, _ in book]
+
+        info = self._analyse(board, multipv=top_n)
+
+        best = []
+        for entry in info:
+            move = entry["pv"][0]
+            score = entry["score"].relative.score()
+            best.append((board.san(move) if move in board.legal_moves else move.uci(),
+                         score))
+        return best
+
+    def board_to_fen(self, board_2d, turn="W", castling="KQkq",
+                     en_passant="-", halfmove="0", fullmove="1"):
+        piece_map = {
+            "RookW": "R", "KnightW": "N", "BishopW": "B",
+            "QueenW": "Q", "KingW": "K", "PownW": "P",
+            "RookB": "r", "KnightB": "n", "BishopB": "b",
+            "QueenB": "q", "KingB": "k", "PownB": "p"
+        }
+
+        if all(all(cell is None for cell in row) for row in board_2d):
+            return "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+        fen_rows = []
+        for row in board_2d:
+            run, fen_row = 0, ""
+            for cell in row:
+                if cell is None:
+                    run += 1
+                else:
+                    if run:
+                        fen_row += str(run)
+                        run = 0
+                    fen_row += piece_map.get(cell, "?")
+            if run:
+                fen_row += str(run)
+            fen_rows.append(fen_row)
+
+        board_part = "/".join(fen_rows[::-1])
+        return f"{board_part} {'w' if turn == 'W' else 'b'} {castling} {en_passant} {halfmove} {fullmove}"
+
+    def evaluate_position(self, fen: str):
+        board = chess.Board(fen)
+        info = self._analyse(board)
+
+        score = info["score"].relative
+        if score.is_mate():
+            moves = abs(score.mate())
+            winner = "White" if score.mate() > 0 else "Black"
+            return f"{winner} mates in {moves}"
+        return f"Evaluation: {score.score() / 100:.2f}"
+
+    def set_fen(self, board_2d, fen: str):
+        """
+        In-place update of your 8×8 list-of-lists `board_2d`
+        to match *fen*.
+
+        board_2d comes from ChessBoard.board and contains either None or
+        string codes like 'RookW', 'PownB', ...
+        """
+        piece_rev = {
+            'R': 'RookW',   'N': 'KnightW', 'B': 'BishopW',
+            'Q': 'QueenW',  'K': 'KingW',   'P': 'PownW',
+            'r': 'RookB',   'n': 'KnightB', 'b': 'BishopB',
+            'q': 'QueenB',  'k': 'KingB',   'p': 'PownB'
+        }
+
+        rows = fen.split()[0].split('/')
+        if len(rows) != 8:
+            raise ValueError("Bad FEN for set_fen")
+
+        for r in range(8):
+            for c in range(8):
+                board_2d[r][c] = None
+
+        for fen_r, row_str in enumerate(rows):
+            board_r = 7 - fen_r         
+            col = 0
+            for ch in row_str:
+                if ch.isdigit():
+                    col += int(ch)
+                else:
+                    board_2d[board_r][col] = piece_rev.get(ch, None)
+                    col += 1
+
+    def evaluate_move(self, fen: str, move_uci: str, multipv: int = 5):
+        """
+        Verdict on one move, from a single engine session: a MultiPV search
+        of the position before it scores the move against the best one and
+        a search after it supplies the best reply.
+        """
+        board = chess.Board(fen)
+        move = chess.Move.from_uci(move_uci)
+        if move not in board.legal_moves:
+            return f"Illegal move: {move_uci}"
+
+        child = board.copy(stack=False)
+        child.push(move)
+        lines, reply = self._search_all([(board, multipv), (child, 1)])
+        return self._verdict(board, move, lines, reply[0])
+
+    def evaluate_game(self, moves, fen: str = chess.STARTING_FEN, multipv: int = 5):
+        """
+        evaluate_move() for every move of a game (UCI strings, in order).
+        Each position is searched once: the MultiPV search of ply n+1 is
+        also the reply search for ply n.
+        """
+        boards = [chess.Board(fen)]
+        for uci in moves:
+            boards.append(boards[-1].copy(stack=False))
+            boards[-1].push_uci(uci)
+        searches = self._search_all([(board, multipv) for board in boards])
+
+        board, verdicts = chess.Board(fen), []
+        for ply, uci in enumerate(moves):
+            move = chess.Move.from_uci(uci)
+            verdicts.append(self._verdict(board, move, searches[ply], searches[ply + 1][0]))
+            board.push(move)
+        return verdicts
+
+    @staticmethod
+    def _verdict(board, move, lines, reply):
+        """Format the verdict on *move* in *board* from the parent lines and the reply search."""
+        cp = lambda info: info["score"].relative.score(mate_score=100000)
+        best = lines[0]
+        played = next((info for info in lines if info.get("pv", [None])[0] == move), None)
+        # a move outside the MultiPV lines is scored by the search after it;
+        # beating the best line there is search noise, not a better move
+        diff = min(0, (cp(played) if played else -cp(reply)) - cp(best))
+
+        san = board.san(move)
+        board.push(move)
+        pv = reply.get("pv")
+        best_reply = board.san(pv[0]) if pv else "—"
+        board.pop()
+
+        verdict = VERDICTS[move_tag(-diff, move == best.get("pv", [None])[0])]
+
+        return (f"{san} ({move.uci()})\n"
+                f"Δ = {diff:+} cp\n"
+                f"Best reply: {best_reply}\n"
+                f"{verdict}")
+
+    @staticmethod
+    def tuple_to_uci(move_tuple):
+        """((row, col), (row, col))  ->  \"e2e4\" (0-based rows/cols)."""
+        def sq(r, c):
+            return chess.square(c, 7 - r)
+        return chess.square_name(sq(*move_tuple[0])) + chess.square_name(sq(*move_tuple[1]))
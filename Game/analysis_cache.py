@@ -0,0 +1,139 @@
+"""
+Cache of engine search results keyed by position, depth and MultiPV.
+
+Two tiers: a bounded in-memory LRU for the current session and a SQLite
+file next to chess_app.db that survives restarts, so the opening plies
+every game passes through are only searched once.  A stored search
+answers any request for the same position at the same or lower depth
+and the same or fewer MultiPV lines.
+"""
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import chess
+import chess.engine
+
+ANALYSIS_DB = "analysis_cache.db"
+
+
+def position_key(board: chess.Board) -> str:
+    """FEN without the move counters; en passant only when a capture is legal."""
+    return " ".join(board.fen(en_passant="legal").split()[:4])
+
+
+def _pack(lines):
+    out = []
+    for info in lines:
+        score = info["score"].relative
+        out.append({"mate" if score.is_mate() else "cp":
+                        score.mate() if score.is_mate() else score.score(),
+                    "pv": [move.uci() for move in info.get("pv", [])],
+                    "depth": info.get("depth")})
+    return out
+
+
+def _unpack(packed, board, multipv):
+    """Stored lines -> the info dicts engine.analyse() returns."""
+    lines = []
+    for entry in packed[:multipv]:
+        score = chess.engine.Mate(entry["mate"]) if "mate" in entry else chess.engine.Cp(entry["cp"])
+        info = {"score": chess.engine.PovScore(score, board.turn), "depth": entry["depth"]}
+        if entry["pv"]:
+            info["pv"] = [chess.Move.from_uci(uci) for uci in entry["pv"]]
+        lines.append(info)
+    return lines
+
+
+def _better(new, old):
+    """Whether cache entry *new* (depth, multipv, ...) should replace *old*."""
+    return new[0] >= old[0] and new[1] >= old[1] and new[:2] != old[:2]
+
+
+class AnalysisCache:
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path: str = ANALYSIS_DB, max_entries: int = 4096):
+        self.db_path     = db_path
+        self.max_entries = max_entries
+        self.hits = self.disk_hits = self.misses = 0
+        self._memory = OrderedDict()        # key -> (depth, multipv, packed lines)
+        self._lock   = threading.Lock()
+        self._db     = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS analysis (
+                position TEXT PRIMARY KEY,      -- position_key()
+                depth    INTEGER NOT NULL,
+                multipv  INTEGER NOT NULL,
+                lines    TEXT NOT NULL          -- JSON, best line first
+            );
+            """)
+        self._db.commit()
+
+    @classmethod
+    def shared(cls, db_path: str = ANALYSIS_DB):
+        with cls._shared_lock:
+            if db_path not in cls._shared:
+                cls._shared[db_path] = cls(db_path)
+            return cls._shared[db_path]
+
+    def get(self, board: chess.Board, depth: int, multipv: int = 1):
+        """Cached lines at least *depth* deep with at least *multipv* lines, else None."""
+        key = position_key(board)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[0] >= depth and entry[1] >= multipv:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return _unpack(entry[2], board, multipv)
+
+            row = self._db.execute("SELECT depth, multipv, lines FROM analysis WHERE position = ?",
+                                   (key,)).fetchone()
+            if row and row[0] >= depth and row[1] >= multipv:
+                entry = (row[0], row[1], json.loads(row[2]))
+                self._remember(key, entry)
+                self.disk_hits += 1
+                return _unpack(entry[2], board, multipv)
+
+            self.misses += 1
+            return None
+
+    def put(self, board: chess.Board, depth: int, multipv: int, lines):
+        """
+        Store a search if it is at least as deep and at least as wide as
+        what is there.  A deeper but narrower search (or the reverse) does
+        not replace an entry: callers asking for different line counts
+        would otherwise keep overwriting each other's deeper results.
+        """
+        key = position_key(board)
+        entry = (depth, multipv, _pack(lines))
+        with self._lock:
+            old = self._memory.get(key)
+            if old and not _better(entry, old):
+                return
+            cur = self._db.execute(
+                """
+                INSERT INTO analysis (position, depth, multipv, lines) VALUES (?, ?, ?, ?)
+                ON CONFLICT(position) DO UPDATE SET
+                    depth = excluded.depth, multipv = excluded.multipv, lines = excluded.lines
+                WHERE excluded.depth >= analysis.depth AND excluded.multipv >= analysis.multipv
+                  AND (excluded.depth > analysis.depth OR excluded.multipv > analysis.multipv)
+                """, (key, depth, multipv, json.dumps(entry[2])))
+            self._db.commit()
+            if cur.rowcount:                        # the disk copy may be better than memory knew
+                self._remember(key, entry)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                    "in_memory": len(self._memory)}
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
@@ -1,10 +1,31 @@
-class BasePiece:
-    def __init__(self, color: str, position: tuple) -> None:
-        self.color = color
-        self.position = position
-
-    def set_position(self, position: tuple) -> None:
-        self.position = position
-    
-    def get_position(self) -> tuple:
-        return self.position
+from bitboard import COLOR_LETTERS, piece_attacks
+
+
+class BasePiece:
+    """
+    Read-only view of one piece for the GUI.  ChessBoard stores pieces as
+    one byte per square; these objects only exist when a page asks for them,
+    and everything shared by a piece type (its KIND and move tables) lives
+    on the class.
+    """
+    __slots__ = ("color", "position")
+    KIND = None
+
+    def __init__(self, color: str, position: tuple) -> None:
+        self.color = color
+        self.position = position
+
+    def set_position(self, position: tuple) -> None:
+        self.position = position
+
+    def get_position(self) -> tuple:
+        return self.position
+
+    def get_possible_moves(self, board) -> list:
+        """Pseudo-legal destinations on a ChessBoard (castling included for kings)."""
+        return board.get_piece_possible_moves(self.position)[1]
+
+    def attacks(self, occupied: int = 0) -> int:
+        """Bitboard of the squares attacked from here when *occupied* is the occupancy."""
+        row, col = self.position
+        return piece_attacks(self.KIND, COLOR_LETTERS.index(self.color), row * 8 + col, occupied)
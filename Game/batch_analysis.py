@@ -0,0 +1,297 @@
+"""
+Headless batch analysis of finished games.
+
+    python batch_analysis.py games.pgn                    PGN, any number of games
+    python batch_analysis.py moves.txt                    one game per line, UCI or SAN
+    python batch_analysis.py --db chess_app.db            games archived by the server
+    python batch_analysis.py games.pgn --workers 16 --depth 18 --out archive.db
+
+Every ply gets the evaluation before the move, the engine's best move,
+the centipawn loss of the move played and a tag (best, good, inaccuracy,
+mistake, blunder); every game gets each side's average centipawn loss.
+Results go to a SQLite store as each game finishes, so an interrupted run
+picks up where it stopped: finished games are skipped and the positions
+of a half-done game come straight back from the analysis cache.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import chess
+import chess.pgn
+
+from ChessEngine import ChessEngine, move_tag
+from database import DatabaseHandler
+
+RESULTS_DB = "batch_analysis.db"
+MATE_CP    = 10000        # mate scores as centipawns, for the stored evals
+LOSS_CAP   = 1000         # a lost won position costs at most this much
+
+
+# ── game sources ─────────────────────────────────────────────────
+# Each yields {"key", "white", "black", "result", "fen", "moves"}; the key
+# is stable across runs so a run can be resumed, the moves are checked by
+# the worker that analyses the game so one bad line does not stop the rest.
+
+def read_pgn(path):
+    name = os.path.basename(path)
+    with open(path, encoding="utf-8", errors="replace") as f:
+        n = 0
+        while True:
+            game = chess.pgn.read_game(f)
+            if game is None:
+                return
+            n += 1
+            headers = game.headers
+            yield {"key": f"{name}#{n}", "white": headers.get("White", "?"),
+                   "black": headers.get("Black", "?"), "result": headers.get("Result", "*"),
+                   "fen": game.board().fen(),
+                   "moves": [move.uci() for move in game.mainline_moves()]}
+
+
+def read_move_lists(path):
+    name = os.path.basename(path)
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            tokens = line.split("#")[0].split()
+            if not tokens:
+                continue
+            yield {"key": f"{name}:{lineno}", "white": "?", "black": "?", "result": "*",
+                   "fen": chess.STARTING_FEN, "moves": tokens}
+
+
+def read_db(path):
+    for game in DatabaseHandler(path).iter_games():
+        yield {"key": f"db:{game['id']}", "white": game["white"], "black": game["black"],
+               "result": game["result"], "fen": chess.STARTING_FEN, "moves": game["moves"]}
+
+
+def to_uci(board, tokens):
+    """
+    UCI or SAN tokens -> UCI strings.  A pawn move to the last rank
+    without a piece is a queen promotion, which is what the client sends.
+    """
+    board, out = board.copy(), []
+    for token in tokens:
+        if token.rstrip(".").isdigit() or token in ("1-0", "0-1", "1/2-1/2", "*"):
+            continue                                    # move numbers and results
+        try:
+            move = chess.Move.from_uci(token)
+            if move not in board.legal_moves:
+                move = chess.Move.from_uci(token + "q")
+            if move not in board.legal_moves:
+                raise ValueError
+        except ValueError:
+            move = board.parse_san(token)               # raises on garbage
+        out.append(move.uci())
+        board.push(move)
+    return out
+
+
+# ── analysis ─────────────────────────────────────────────────────
+def grade(board, move, before, after):
+    """(centipawn loss, tag) of *move* in *board*, from the searches before and after it."""
+    mover = board.turn
+    pv = before.get("pv")
+    best = pv[0] if pv else None
+    capped = lambda info: max(-LOSS_CAP, min(LOSS_CAP, info["score"].pov(mover).score(mate_score=MATE_CP)))
+    cpl = max(0, capped(before) - capped(after)) if move != best else 0
+    return cpl, move_tag(cpl, move == best)
+
+
+def analyse_game(engine, game):
+    """(ply rows, summary) for one game; all its positions in one engine session."""
+    moves = to_uci(chess.Board(game["fen"]), game["moves"])
+    boards = [chess.Board(game["fen"])]
+    for uci in moves:
+        boards.append(boards[-1].copy(stack=False))
+        boards[-1].push_uci(uci)
+    infos = engine.analyse_many(boards)
+
+    rows, loss = [], {chess.WHITE: [], chess.BLACK: []}
+    blunders = {chess.WHITE: 0, chess.BLACK: 0}
+    for ply, uci in enumerate(moves):
+        board, before, after = boards[ply], infos[ply], infos[ply + 1]
+        move, mover = chess.Move.from_uci(uci), boards[ply].turn
+        pv = before.get("pv")
+        best = pv[0] if pv else None
+
+        cpl, tag = grade(board, move, before, after)
+        loss[mover].append(cpl)
+        blunders[mover] += tag == "blunder"
+
+        white = before["score"].white()
+        rows.append((ply + 1, board.fen(), uci, board.san(move),
+                     board.san(best) if best else None,
+                     white.score(mate_score=MATE_CP), white.mate(), cpl, tag))
+
+    acpl = lambda side: round(sum(loss[side]) / len(loss[side]), 1) if loss[side] else None
+    summary = {"plies": len(rows),
+               "acpl_white": acpl(chess.WHITE), "acpl_black": acpl(chess.BLACK),
+               "blunders_white": blunders[chess.WHITE], "blunders_black": blunders[chess.BLACK]}
+    return rows, summary
+
+
+# ── output store ─────────────────────────────────────────────────
+class ResultStore:
+    def __init__(self, path=RESULTS_DB):
+        self._db = sqlite3.connect(path)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS games (
+                key            TEXT PRIMARY KEY,       -- source file + index, or db:<id>
+                white          TEXT,
+                black          TEXT,
+                result         TEXT,
+                depth          INTEGER,
+                plies          INTEGER,
+                acpl_white     REAL,
+                acpl_black     REAL,
+                blunders_white INTEGER,
+                blunders_black INTEGER,
+                error          TEXT,                   -- set when the game could not be analysed
+                finished_at    TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS plies (
+                game_key  TEXT NOT NULL,
+                ply       INTEGER NOT NULL,            -- 1 = White's first move
+                fen       TEXT NOT NULL,               -- before the move
+                move      TEXT NOT NULL,               -- UCI
+                san       TEXT NOT NULL,
+                best      TEXT,                        -- engine's move, SAN
+                eval_cp   INTEGER,                     -- before the move, White's view
+                mate      INTEGER,                     -- mate in n, White's view, else NULL
+                cpl       INTEGER NOT NULL,
+                tag       TEXT NOT NULL,               -- best|good|inaccuracy|mistake|blunder
+                PRIMARY KEY (game_key, ply)
+            );
+            """)
+
+    def done(self, depth):
+        """Keys of games already analysed at least *depth* deep."""
+        return {r[0] for r in self._db.execute(
+            "SELECT key FROM games WHERE error IS NULL AND depth >= ?", (depth,))}
+
+    def save(self, game, depth, rows, summary):
+        with self._db:                                  # one transaction per game
+            self._db.execute("DELETE FROM plies WHERE game_key = ?", (game["key"],))
+            self._db.executemany("INSERT INTO plies VALUES (?,?,?,?,?,?,?,?,?,?)",
+                                 [(game["key"], *row) for row in rows])
+            self._db.execute("""
+                INSERT OR REPLACE INTO games (key, white, black, result, depth, plies,
+                    acpl_white, acpl_black, blunders_white, blunders_black)
+                VALUES (?,?,?,?,?,?,?,?,?,?)
+                """, (game["key"], game["white"], game["black"], game["result"], depth,
+                      summary["plies"], summary["acpl_white"], summary["acpl_black"],
+                      summary["blunders_white"], summary["blunders_black"]))
+
+    def save_error(self, game, depth, error):
+        with self._db:
+            self._db.execute("""
+                INSERT OR REPLACE INTO games (key, white, black, result, depth, error)
+                VALUES (?,?,?,?,?,?)
+                """, (game["key"], game["white"], game["black"], game["result"], depth, error))
+
+    def close(self):
+        self._db.close()
+
+
+# ── driver ───────────────────────────────────────────────────────
+class Progress:
+    def __init__(self, engine, every):
+        self.engine, self.every = engine, every
+        self.games = self.plies = self.skipped = self.failed = 0
+        self.start = self.last = time.perf_counter()
+
+    def maybe_report(self, force=False):
+        now = time.perf_counter()
+        if not force and now - self.last < self.every:
+            return
+        self.last = now
+        elapsed = max(now - self.start, 1e-9)
+        cache = self.engine.cache.stats() if self.engine.cache else {"hit_rate": 0.0}
+        print(f"[{elapsed:7.0f}s] {self.games} games, {self.plies} plies "
+              f"({self.plies / elapsed:,.1f} plies/s, {self.games * 60 / elapsed:,.1f} games/min), "
+              f"{self.skipped} skipped, {self.failed} failed, "
+              f"cache hit rate {cache['hit_rate']:.0%}", flush=True)
+
+
+def run(games, store, engine, workers, report_every=10.0):
+    """Analyse *games* on *workers* threads, each keeping one engine process busy."""
+    done = store.done(engine.depth)
+    progress = Progress(engine, report_every)
+    inflight = {}
+
+    def collect(futures):
+        for future in futures:
+            game = inflight.pop(future)
+            try:
+                rows, summary = future.result()
+            except Exception as e:
+                progress.failed += 1
+                store.save_error(game, engine.depth, f"{type(e).__name__}: {e}")
+                continue
+            store.save(game, engine.depth, rows, summary)
+            progress.games += 1
+            progress.plies += len(rows)
+
+    with ThreadPoolExecutor(workers, thread_name_prefix="analysis") as pool:
+        try:
+            for game in games:
+                if game["key"] in done:
+                    progress.skipped += 1
+                    continue
+                inflight[pool.submit(analyse_game, engine, game)] = game
+                # a couple of games queued per worker; the rest stay unread
+                while len(inflight) >= 2 * workers:
+                    finished, _ = wait(inflight, timeout=report_every, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                    progress.maybe_report()
+            while inflight:
+                finished, _ = wait(inflight, timeout=report_every, return_when=FIRST_COMPLETED)
+                collect(finished)
+                progress.maybe_report()
+        except KeyboardInterrupt:
+            print("Interrupted, finishing the games in progress; run again to resume.")
+            pool.shutdown(wait=False, cancel_futures=True)
+            collect([f for f in list(inflight) if not f.cancelled()])
+    progress.maybe_report(force=True)
+    return progress
+
+
+def read_games(args):
+    if args.db:
+        return read_db(args.db)
+    if args.input.lower().endswith(".pgn"):
+        return read_pgn(args.input)
+    return read_move_lists(args.input)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Analyse archived games without the GUI")
+    ap.add_argument("input", nargs="?", help=".pgn file, or a text file of move lists")
+    ap.add_argument("--db", help="analyse the games archived in this chess_app.db instead")
+    ap.add_argument("--out", default=RESULTS_DB, help="SQLite file for the results")
+    ap.add_argument("--engine", default="stockfish/stockfish.exe")
+    ap.add_argument("--depth", type=int, default=16)
+    ap.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                    help="engine processes, one game each")
+    ap.add_argument("--hash", type=int, default=64, help="MB of hash per engine")
+    ap.add_argument("--report-every", type=float, default=10.0, help="seconds between progress lines")
+    args = ap.parse_args(argv)
+    if not args.input and not args.db:
+        ap.error("give an input file or --db")
+
+    engine = ChessEngine(args.engine, depth=args.depth, pool_size=args.workers, hash_mb=args.hash)
+    store = ResultStore(args.out)
+    try:
+        progress = run(read_games(args), store, engine, args.workers, args.report_every)
+    finally:
+        store.close()
+    return 1 if progress.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+64-bit bitboard tables and attack generation used by ChessBoard.
+
+Squares are numbered like python-chess (a1 = 0 … h8 = 63), which lines up
+with ChessBoard's (row, col) grid as  square = row * 8 + col.
+"""
+
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+COLOR_LETTERS = ("W", "B")                     # the colour strings pieces/*.py use
+PIECE_NAMES   = ("Pown", "Knight", "Bishop", "Rook", "Queen", "King")
+
+LIGHT_SQUARES = 0x55AA55AA55AA55AA
+DARK_SQUARES  = 0xAA55AA55AA55AA55
+
+
+def square(pos):
+    """(row, col) -> 0..63"""
+    return pos[0] * 8 + pos[1]
+
+
+def square_pos(sq):
+    """0..63 -> (row, col)"""
+    return (sq >> 3, sq & 7)
+
+
+def lsb(bb):
+    return (bb & -bb).bit_length() - 1
+
+
+def scan(bb):
+    """Yield the index of every set bit, lowest first."""
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def to_positions(bb):
+    """Bitboard -> list of (row, col) tuples, the format the pages use."""
+    out = []
+    while bb:
+        low = bb & -bb
+        sq = low.bit_length() - 1
+        out.append((sq >> 3, sq & 7))
+        bb ^= low
+    return out
+
+
+# ── leaper tables ─────────────────────────────────────────────────
+def _step_table(deltas):
+    table = []
+    for sq in range(64):
+        r, c = divmod(sq, 8)
+        bb = 0
+        for dr, dc in deltas:
+            if 0 <= r + dr < 8 and 0 <= c + dc < 8:
+                bb |= 1 << ((r + dr) * 8 + c + dc)
+        table.append(bb)
+    return table
+
+
+KNIGHT_ATTACKS = _step_table([(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+                              (1, -2), (1, 2), (2, -1), (2, 1)])
+KING_ATTACKS   = _step_table([(1, 0), (-1, 0), (0, 1), (0, -1),
+                              (1, 1), (-1, 1), (1, -1), (-1, -1)])
+PAWN_ATTACKS   = [_step_table([(1, -1), (1, 1)]),       # indexed by colour
+                  _step_table([(-1, -1), (-1, 1)])]
+
+
+# ── slider tables ─────────────────────────────────────────────────
+# Every rank, file and diagonal through a square gets its own table that
+# maps the occupancy of that line (masked to the squares that can block)
+# straight to the attack set, so a rook or bishop lookup is two dict hits.
+def _ray(sq, dr, dc):
+    r, c = divmod(sq, 8)
+    out = []
+    r, c = r + dr, c + dc
+    while 0 <= r < 8 and 0 <= c < 8:
+        out.append(r * 8 + c)
+        r, c = r + dr, c + dc
+    return out
+
+
+def _line_tables(directions):
+    masks, tables = [], []
+    for sq in range(64):
+        rays = [_ray(sq, dr, dc) for dr, dc in directions]
+        # the last square of a ray is attacked whatever sits on it
+        mask = 0
+        for ray in rays:
+            for s in ray[:-1]:
+                mask |= 1 << s
+
+        table = {}
+        sub = 0
+        while True:
+            attacks = 0
+            for ray in rays:
+                for s in ray:
+                    attacks |= 1 << s
+                    if sub >> s & 1:
+                        break
+            table[sub] = attacks
+            sub = (sub - mask) & mask
+            if not sub:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+
+RANK_MASKS, RANK_ATTACKS = _line_tables([(0, 1), (0, -1)])
+FILE_MASKS, FILE_ATTACKS = _line_tables([(1, 0), (-1, 0)])
+DIAG_MASKS, DIAG_ATTACKS = _line_tables([(1, 1), (-1, -1)])
+ANTI_MASKS, ANTI_ATTACKS = _line_tables([(1, -1), (-1, 1)])
+
+
+def bishop_attacks(sq, occupied):
+    return (DIAG_ATTACKS[sq][occupied & DIAG_MASKS[sq]] |
+            ANTI_ATTACKS[sq][occupied & ANTI_MASKS[sq]])
+
+
+def rook_attacks(sq, occupied):
+    return (RANK_ATTACKS[sq][occupied & RANK_MASKS[sq]] |
+            FILE_ATTACKS[sq][occupied & FILE_MASKS[sq]])
+
+
+def queen_attacks(sq, occupied):
+    return bishop_attacks(sq, occupied) | rook_attacks(sq, occupied)
+
+
+def piece_attacks(kind, color, sq, occupied):
+    """Squares attacked by a *kind* piece of *color* standing on *sq*."""
+    if kind == PAWN:
+        return PAWN_ATTACKS[color][sq]
+    if kind == KNIGHT:
+        return KNIGHT_ATTACKS[sq]
+    if kind == BISHOP:
+        return bishop_attacks(sq, occupied)
+    if kind == ROOK:
+        return rook_attacks(sq, occupied)
+    if kind == QUEEN:
+        return queen_attacks(sq, occupied)
+    return KING_ATTACKS[sq]
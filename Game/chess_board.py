@@ -1,137 +1,592 @@
-
-from helper import Helper
-from pieces.King import King
-from ChessEngine import ChessEngine
-from pieces.Pawn  import Pown          
-from pieces.Queen import Queen         
-
-
-class ChessBoard:
-    def __init__(self):
-        self.helper = Helper()
-        self.engine = ChessEngine()
-        self.set_board()
-        self.update_fen()
-
-    def set_board(self):
-        self.board = [[None] * 8 for _ in range(8)]
-        self.helper.set_all_pieces_on_board(self.board)
-        self.update_fen()
-
-    def get_normal_board(self):
-        board_codes = []
-        for row in self.board:
-            row_codes = []
-            for cell in row:
-                if cell is None or isinstance(cell, str):
-                    row_codes.append(cell)
-                else:
-                    row_codes.append(f"{cell.__class__.__name__}{cell.color}")
-            board_codes.append(row_codes)
-        return board_codes
-
-
-    def update_fen(self):
-        self.fen = self.engine.board_to_fen(self.get_normal_board())
-
-    def get_piece_possible_moves(self, pos):
-        r, c = pos
-        p = self.board[r][c]
-        if p is None or isinstance(p, str):
-            return ("None", [])
-        return (p.__class__.__name__, p.get_possible_moves(self.board))
-
-    def make_move(self, frm, to, turn_color):
-        piece = self.board[frm[0]][frm[1]]
-        if piece is None:
-            return False
-        
-        if isinstance(piece, King) and frm[0] == to[0] and abs(to[1] - frm[1]) == 2:
-            rook_col = 7 if to[1] > frm[1] else 0
-            return self._try_castling(frm, (frm[0], rook_col), turn_color)
-
-        _, legal = self.get_piece_possible_moves(frm)
-        if to not in legal:
-            return False
-        
-        captured = self.board[to[0]][to[1]]
-        self._move_piece(frm, to)
-        if self._in_check(turn_color):
-            self._move_piece(to, frm)
-            self.board[to[0]][to[1]] = captured
-            return False
-
-        if isinstance(piece, Pown):
-            promote_row = 7 if piece.color == 'W' else 0
-            if to[0] == promote_row:
-                self.board[to[0]][to[1]] = Queen(piece.color, to)
-
-        self.update_fen()
-        return True
-
-
-    def _try_castling(self, king_pos, rook_pos, color):
-        king = self.board[king_pos[0]][king_pos[1]]
-        rook = self.board[rook_pos[0]][rook_pos[1]]
-
-        if (not isinstance(king, King) or rook is None or
-                getattr(king, "has_moved", False) or
-                getattr(rook, "has_moved", False)):
-            return False
-
-        step = 1 if rook_pos[1] > king_pos[1] else -1
-        path = []
-        c = king_pos[1] + step
-        while c != rook_pos[1]:
-            path.append((king_pos[0], c))
-            c += step
-        if any(self.board[r][c] is not None for r, c in path):
-            return False
-
-        king_steps = path[:2] 
-        if self._in_check(color) or any(self._square_attacked(sq, color) for sq in king_steps):
-            return False
-
-        new_king = king_steps[-1]
-        new_rook = (rook_pos[0], new_king[1] - step)
-        self._move_piece(king_pos, new_king)
-        self._move_piece(rook_pos, new_rook)
-        king.has_moved = True
-        rook.has_moved = True
-        self.update_fen()
-        return True
-
-    def _move_piece(self, frm, to):
-        obj = self.board[frm[0]][frm[1]]
-        self.board[frm[0]][frm[1]] = None
-        if obj and not isinstance(obj, str):
-            obj.set_position(to)
-            if hasattr(obj, "has_moved"):
-                obj.has_moved = True
-        self.board[to[0]][to[1]] = obj
-
-    def _find_king(self, color):
-        target = "W" if color == "white" else "B"
-        for r in range(8):
-            for c in range(8):
-                p = self.board[r][c]
-                if isinstance(p, King) and p.color == target:
-                    return (r, c)
-        return None
-
-    def _square_attacked(self, square, defender_color):
-        enemy = "B" if defender_color == "white" else "W"
-        for r in range(8):
-            for c in range(8):
-                p = self.board[r][c]
-                if p is None or isinstance(p, str) or p.color != enemy:
-                    continue
-                raw = p.get_possible_moves(self.board)
-                moves = raw[1] if isinstance(raw, tuple) else raw
-                if square in moves:
-                    return True
-        return False
-
-    def _in_check(self, color):
-        ksq = self._find_king(color)
-        return ksq is None or self._square_attacked(ksq, color)
+import threading
+from array import array
+from itertools import count
+from pieces.King import King
+from pieces.Pawn  import Pown
+from pieces.Queen import Queen
+from pieces.Rook import Rook
+from pieces.Bishop import Bishop
+from pieces.Knight import Knight
+from bitboard import (WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING,
+                      COLOR_LETTERS, PIECE_NAMES, KNIGHT_ATTACKS, KING_ATTACKS,
+                      PAWN_ATTACKS, LIGHT_SQUARES, DARK_SQUARES, bishop_attacks,
+                      rook_attacks, piece_attacks, lsb, scan, to_positions)
+from zobrist import PIECE_KEYS, CASTLING_KEYS, EP_KEYS, TURN_KEY
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+CASTLE_K, CASTLE_Q, CASTLE_k, CASTLE_q = 1, 2, 4, 8
+# a king or rook leaving (or a capture landing on) these squares loses the right
+CASTLE_LOST = {0: CASTLE_Q, 7: CASTLE_K, 4: CASTLE_K | CASTLE_Q,
+               56: CASTLE_q, 63: CASTLE_k, 60: CASTLE_k | CASTLE_q}
+CASTLE_KEEP = [15 & ~CASTLE_LOST.get(sq, 0) for sq in range(64)]
+# per colour: (rook square, king destination, squares that must be empty)
+CASTLING_PATHS = [[(7, 6, 0x60), (0, 2, 0x0E)],
+                  [(63, 62, 0x60 << 56), (56, 58, 0x0E << 56)]]
+CASTLING_FIELDS = ["".join(ch for bit, ch in zip((1, 2, 4, 8), "KQkq") if mask & bit) or "-"
+                   for mask in range(16)]
+
+PROMOTIONS = {"q": QUEEN, "r": ROOK, "b": BISHOP, "n": KNIGHT}
+
+# A square holds one byte: 0 when empty, else colour << 3 | (piece type + 1),
+# so white pieces are 1..6 and black ones 9..14.  Everything else a piece
+# needs (name, FEN letter, Zobrist keys, GUI class) lives in these
+# per-code tables instead of on per-piece objects.
+VIEWS      = (Pown, Knight, Bishop, Rook, Queen, King)
+CODE_INDEX = [0] * 16       # code -> index into ChessBoard.pieces (colour * 6 + type)
+CODE_NAMES = [None] * 16    # code -> 'RookW'-style name used by the pages
+FEN_CHARS  = [""] * 16
+CODE_KEYS  = [None] * 16    # code -> Zobrist key per square
+FEN_CODES  = {}
+for _color in (WHITE, BLACK):
+    for _kind in range(6):
+        _code = _color << 3 | (_kind + 1)
+        CODE_INDEX[_code] = _color * 6 + _kind
+        CODE_NAMES[_code] = PIECE_NAMES[_kind] + COLOR_LETTERS[_color]
+        FEN_CHARS[_code]  = "PNBRQK"[_kind] if _color == WHITE else "pnbrqk"[_kind]
+        CODE_KEYS[_code]  = PIECE_KEYS[_color][_kind]
+        FEN_CODES[FEN_CHARS[_code]] = _code
+
+# every position reached on any board gets a fresh number
+_versions = count(1)
+
+
+class ChessBoard:
+    """
+    Board state as flat buffers: a 64-byte square array, twelve piece
+    bitboards and the attack set of every square.  Each move on the undo
+    stack is a single packed 64-bit integer, and the piece classes in
+    pieces/ are only built on demand as views for the GUI.
+    """
+    __slots__ = ("squares", "pieces", "occupied", "attacks_from", "attack_map",
+                 "turn", "castling", "ep_square", "halfmove_clock", "fullmove_number",
+                 "move_stack", "key_history", "zobrist_key", "version",
+                 "_versions", "_dirty_ranks", "_fen_rows", "_fen_cache", "_codes_cache",
+                 "_legal_cache", "_lock")
+
+    def __init__(self, fen=START_FEN):
+        # the GUI thread reads and generates moves while network/engine
+        # threads play them; the lock keeps a move and its legality test
+        # together, and generation never touches this board at all
+        self._lock = threading.RLock()
+        self.set_fen(fen)
+
+    def set_board(self):
+        self.set_fen(START_FEN)
+
+    def set_fen(self, fen: str):
+        """Load a full FEN, e.g. the snapshot a spectator receives."""
+        fields = fen.split()
+        rows = fields[0].split("/")
+        if len(rows) != 8:
+            raise ValueError("Bad FEN for set_fen")
+        fields += ["w", "-", "-", "0", "1"][len(fields) - 1:]
+
+        squares = bytearray(64)
+        for fen_r, row_str in enumerate(rows):
+            sq = (7 - fen_r) * 8
+            for ch in row_str:
+                if ch.isdigit():
+                    sq += int(ch)
+                else:
+                    squares[sq] = FEN_CODES[ch]
+                    sq += 1
+
+        ep = None
+        if fields[3] != "-":
+            ep = (int(fields[3][1]) - 1) * 8 + ord(fields[3][0]) - ord("a")
+        self.squares    = squares
+        self.turn       = WHITE if fields[1] == "w" else BLACK
+        self.castling   = sum(bit for bit, ch in zip((1, 2, 4, 8), "KQkq") if ch in fields[2])
+        self.ep_square  = ep
+        self.halfmove_clock  = int(fields[4])
+        self.fullmove_number = int(fields[5])
+        self.move_stack = array("Q")
+        self._versions  = array("Q")
+        self._sync_bitboards()
+        self.version = next(_versions)
+        self.zobrist_key ^= self._state_key()
+        self.key_history = array("Q", [self.zobrist_key])
+
+    def copy(self, stack=True):
+        """
+        Independent clone: a handful of flat buffer copies, no piece objects.
+        With stack=False the clone can't pop() past its starting position.
+        """
+        other = ChessBoard.__new__(ChessBoard)
+        other.squares      = self.squares[:]
+        other.pieces       = self.pieces[:]
+        other.occupied     = self.occupied[:]
+        other.attacks_from = self.attacks_from[:]
+        other.attack_map   = self.attack_map[:]
+        other.turn, other.castling, other.ep_square = self.turn, self.castling, self.ep_square
+        other.halfmove_clock, other.fullmove_number = self.halfmove_clock, self.fullmove_number
+        other.zobrist_key, other.version = self.zobrist_key, self.version
+        other.key_history  = self.key_history[:]
+        other.move_stack   = self.move_stack[:] if stack else array("Q")
+        other._versions    = self._versions[:] if stack else array("Q")
+        other._dirty_ranks = 0xFF
+        other._fen_rows = other._fen_cache = other._codes_cache = None
+        other._legal_cache = self._legal_cache
+        other._lock = threading.RLock()
+        return other
+
+    # ── views ─────────────────────────────────────────────────────
+    def piece_at(self, pos):
+        """The piece on (row, col) as a pieces/ object, or None."""
+        code = self.squares[pos[0] * 8 + pos[1]]
+        if not code:
+            return None
+        return VIEWS[(code & 7) - 1](COLOR_LETTERS[code >> 3], tuple(pos))
+
+    @property
+    def board(self):
+        """8×8 grid of piece objects, built fresh on every access."""
+        return [[self.piece_at((r, c)) for c in range(8)] for r in range(8)]
+
+    def get_normal_board(self):
+        """8×8 grid of 'RookW'-style codes for the current position (read only)."""
+        cache = self._codes_cache
+        if cache is None or cache[0] != self.version:
+            squares = self.squares
+            grid = [[CODE_NAMES[squares[r * 8 + c]] for c in range(8)] for r in range(8)]
+            cache = self._codes_cache = (self.version, grid)
+        return cache[1]
+
+    @property
+    def fen(self):
+        cache = self._fen_cache
+        if cache is None or cache[0] != self.version:
+            cache = self._fen_cache = (self.version, self._build_fen())
+        return cache[1]
+
+    def update_fen(self):
+        return self.fen
+
+    def _build_fen(self):
+        rows = self._fen_rows
+        if rows is None:
+            rows = self._fen_rows = [""] * 8
+            self._dirty_ranks = 0xFF
+        squares = self.squares
+        for r in scan(self._dirty_ranks):
+            run, out = 0, ""
+            for code in squares[r * 8:r * 8 + 8]:
+                if not code:
+                    run += 1
+                    continue
+                if run:
+                    out += str(run)
+                    run = 0
+                out += FEN_CHARS[code]
+            rows[r] = out + str(run) if run else out
+        self._dirty_ranks = 0
+        return (f"{'/'.join(rows[::-1])} {'w' if self.turn == WHITE else 'b'} "
+                f"{CASTLING_FIELDS[self.castling]} {self._ep_field()} "
+                f"{self.halfmove_clock} {self.fullmove_number}")
+
+    def _ep_field(self):
+        ep = self._ep_capturable()
+        return "-" if ep is None else "abcdefgh"[ep & 7] + str((ep >> 3) + 1)
+
+    def _ep_capturable(self):
+        """The en-passant square if a pawn of the side to move could take on it."""
+        ep = self.ep_square
+        if ep is None or not PAWN_ATTACKS[self.turn ^ 1][ep] & self.pieces[self.turn * 6 + PAWN]:
+            return None
+        return ep
+
+    def _state_key(self):
+        """Zobrist part for side to move, castling rights and en passant."""
+        key = CASTLING_KEYS[self.castling]
+        if self.turn == WHITE:
+            key ^= TURN_KEY
+        ep = self._ep_capturable()
+        if ep is not None:
+            key ^= EP_KEYS[ep & 7]
+        return key
+
+    # ── moves ─────────────────────────────────────────────────────
+    def get_piece_possible_moves(self, pos):
+        sq = pos[0] * 8 + pos[1]
+        code = self.squares[sq]
+        if not code:
+            return ("None", [])
+        targets = self._targets(sq)
+        if (code & 7) - 1 == KING:
+            targets |= self._castling_targets(sq, code >> 3)
+        return (PIECE_NAMES[(code & 7) - 1], to_positions(targets))
+
+    def legal_moves_from(self, pos):
+        """Legal destinations of the piece on *pos*; empty unless it is that side's turn."""
+        return to_positions(self._legal().get(pos[0] * 8 + pos[1], 0))
+
+    def make_move(self, frm, to, turn_color, promotion="q"):
+        # the board's own side to move decides legality, whatever the caller passed
+        frm_sq, to_sq = frm[0] * 8 + frm[1], to[0] * 8 + to[1]
+        with self._lock:
+            if not self._legal().get(frm_sq, 0) >> to_sq & 1:
+                return False
+            self._push(frm_sq, to_sq, PROMOTIONS[promotion])
+        return True
+
+    def push(self, frm, to, promotion="q"):
+        """
+        Play frm -> to without any legality test and record how to undo it.
+        A two-square king step castles, a pawn landing on the en-passant
+        square captures en passant and a pawn reaching the last rank
+        becomes *promotion* ('q', 'r', 'b' or 'n').
+        """
+        with self._lock:
+            self._push(frm[0] * 8 + frm[1], to[0] * 8 + to[1], PROMOTIONS[promotion or "q"])
+
+    def pop(self):
+        """Take back the last push() and return its (frm, to)."""
+        with self._lock:
+            frm, to = self._pop()
+        return (frm >> 3, frm & 7), (to >> 3, to & 7)
+
+    def _push(self, frm, to, promotion):
+        squares = self.squares
+        moved = squares[frm]
+        color, kind = moved >> 3, (moved & 7) - 1
+        ep = self.ep_square
+        taken_at = to
+        if kind == PAWN and to == ep and (frm ^ to) & 7:
+            taken_at = (frm & 56) | (to & 7)
+        captured = squares[taken_at]
+
+        # frm, to, moved and captured codes, en passant, castling and the
+        # halfmove clock packed into one integer; the rest follows from them
+        self.move_stack.append(frm | to << 6 | moved << 12 | captured << 16 |
+                               (64 if ep is None else ep) << 20 | self.castling << 27 |
+                               (self.halfmove_clock & 0xFFFFFFFF) << 31)
+        self._versions.append(self.version)
+        state_before = self._state_key()
+
+        if captured:
+            self._place(taken_at, 0)
+        self._place(frm, 0)
+        self._place(to, moved)
+        if kind == KING and abs(to - frm) == 2:
+            rook_from = to | 7 if to > frm else to & 56
+            self._place((frm + to) >> 1, squares[rook_from])
+            self._place(rook_from, 0)
+
+        self.castling &= CASTLE_KEEP[frm] & CASTLE_KEEP[to]
+        self.ep_square = None
+        if kind == PAWN:
+            if abs(to - frm) == 16:
+                self.ep_square = (frm + to) >> 1
+            elif to >> 3 in (0, 7):
+                self._place(to, color << 3 | (promotion + 1))
+
+        self.halfmove_clock = 0 if kind == PAWN or captured else self.halfmove_clock + 1
+        if color == BLACK:
+            self.fullmove_number += 1
+        self.turn = color ^ 1
+        self.version = next(_versions)
+        self.zobrist_key ^= state_before ^ self._state_key()
+        self.key_history.append(self.zobrist_key)
+
+    def _pop(self):
+        rec = self.move_stack.pop()
+        frm, to = rec & 63, rec >> 6 & 63
+        moved, captured = rec >> 12 & 15, rec >> 16 & 15
+        ep = rec >> 20 & 127
+        kind = (moved & 7) - 1
+
+        self._place(to, 0)
+        self._place(frm, moved)
+        if kind == KING and abs(to - frm) == 2:
+            rook_to = (frm + to) >> 1
+            self._place(to | 7 if to > frm else to & 56, self.squares[rook_to])
+            self._place(rook_to, 0)
+        if captured:
+            en_passant = kind == PAWN and to == ep and (frm ^ to) & 7
+            self._place((frm & 56) | (to & 7) if en_passant else to, captured)
+
+        self.ep_square = None if ep == 64 else ep
+        self.castling  = rec >> 27 & 15
+        self.halfmove_clock = rec >> 31 & 0xFFFFFFFF
+        self.turn = moved >> 3
+        if self.turn == BLACK:
+            self.fullmove_number -= 1
+        # pop() hands the old version back, so anything cached against it stays valid
+        self.version = self._versions.pop()
+        self.key_history.pop()
+        self.zobrist_key = self.key_history[-1]
+        return frm, to
+
+    # ── game end ──────────────────────────────────────────────────
+    def legal_moves(self):
+        """Yield every legal (frm, to, promotion) for the side to move."""
+        pawns = self.pieces[self.turn * 6 + PAWN]
+        seventh = 6 if self.turn == WHITE else 1
+        for sq, targets in self._legal().items():
+            frm = (sq >> 3, sq & 7)
+            promoting = pawns >> sq & 1 and sq >> 3 == seventh
+            for to in scan(targets):
+                if promoting:
+                    for promotion in PROMOTIONS:
+                        yield (frm, (to >> 3, to & 7), promotion)
+                else:
+                    yield (frm, (to >> 3, to & 7), None)
+
+    def has_legal_move(self):
+        """Stops at the first legal move found, unless the full set is already cached."""
+        cache = self._legal_cache
+        if cache is not None and cache[0] == self.version:
+            return bool(cache[1])
+        version, probe = self._probe()
+        side = probe.turn
+        for sq in scan(probe.occupied[side]):
+            if probe._legal_targets(sq, side, first=True):
+                return True
+        self._legal_cache = (version, {})
+        return False
+
+    def _legal(self):
+        """
+        {from square: bitboard of legal destinations} for the side to move.
+        Worked out once per position and kept against its version, so the
+        GUI, make_move and the game-end checks all share one generation.
+        """
+        cache = self._legal_cache
+        if cache is not None and cache[0] == self.version:
+            return cache[1]
+        version, probe = self._probe()
+        side = probe.turn
+        legal = {}
+        for sq in scan(probe.occupied[side]):
+            targets = probe._legal_targets(sq, side)
+            if targets:
+                legal[sq] = targets
+        self._legal_cache = (version, legal)
+        return legal
+
+    def _probe(self):
+        """
+        (version, private copy) to try moves on: other threads may be
+        reading this board, so its own squares never hold a probe move.
+        """
+        with self._lock:
+            return self.version, self.copy(stack=False)
+
+    def _legal_targets(self, sq, side, first=False):
+        """Bitboard of legal destinations from *sq*; with first=True, stop at the first one."""
+        targets = 0
+        for to in scan(self._targets(sq)):
+            self._push(sq, to, QUEEN)
+            if not self._king_attacked(side):
+                targets |= 1 << to
+            self._pop()
+            if targets and first:
+                return targets
+        if self.squares[sq] & 7 == KING + 1:
+            for to in scan(self._castling_targets(sq, side)):
+                if self._castling_legal(sq, to):
+                    targets |= 1 << to
+                    if first:
+                        break
+        return targets
+
+    def is_check(self):
+        return self._king_attacked(self.turn)
+
+    def is_checkmate(self):
+        return self.is_check() and not self.has_legal_move()
+
+    def is_stalemate(self):
+        return not self.is_check() and not self.has_legal_move()
+
+    def is_insufficient_material(self):
+        p, w, b = self.pieces, WHITE * 6, BLACK * 6
+        if (p[w + PAWN] | p[w + ROOK] | p[w + QUEEN] |
+                p[b + PAWN] | p[b + ROOK] | p[b + QUEEN]):
+            return False
+        knights = p[w + KNIGHT] | p[b + KNIGHT]
+        bishops = p[w + BISHOP] | p[b + BISHOP]
+        minors = knights | bishops
+        if not minors & (minors - 1):
+            return True         # bare kings, or one knight or bishop in total
+        # any number of bishops, all on squares of one colour
+        return not knights and (not bishops & LIGHT_SQUARES or not bishops & DARK_SQUARES)
+
+    def is_fifty_moves(self):
+        return self.halfmove_clock >= 100
+
+    def is_repetition(self, count=3):
+        """Has the current position occurred *count* times (captures and pawn moves reset it)?"""
+        key, seen = self.zobrist_key, 0
+        # an irreversible move can't be undone, so older positions never match
+        for past in self.key_history[-1:-self.halfmove_clock - 2:-2]:
+            if past == key:
+                seen += 1
+                if seen >= count:
+                    return True
+        return False
+
+    def outcome(self):
+        """None while the game goes on, else ("White" | "Black" | "Draw", reason)."""
+        if not self.has_legal_move():
+            if self.is_check():
+                return ("White" if self.turn == BLACK else "Black", "checkmate")
+            return ("Draw", "stalemate")
+        if self.is_insufficient_material():
+            return ("Draw", "insufficient material")
+        if self.is_fifty_moves():
+            return ("Draw", "fifty-move rule")
+        if self.is_repetition(3):
+            return ("Draw", "threefold repetition")
+        return None
+
+
+    def _castling_legal(self, king_sq, dest):
+        code = self.squares[king_sq]
+        if (code & 7) - 1 != KING:
+            return False
+        side = code >> 3
+        if not self._castling_targets(king_sq, side) >> dest & 1:
+            return False
+        # the king may not start in, pass through or land on an attacked square
+        path = 1 << king_sq | 1 << ((king_sq + dest) >> 1) | 1 << dest
+        return not self._attacked_by(side ^ 1) & path
+
+    def _find_king(self, color):
+        kings = self.pieces[(WHITE if color == "white" else BLACK) * 6 + KING]
+        if not kings:
+            return None
+        sq = lsb(kings)
+        return (sq >> 3, sq & 7)
+
+    def _square_attacked(self, square, defender_color):
+        enemy = BLACK if defender_color == "white" else WHITE
+        return bool(self._attacked_by(enemy) >> (square[0] * 8 + square[1]) & 1)
+
+    def _in_check(self, color):
+        return self._king_attacked(WHITE if color == "white" else BLACK)
+
+    def _king_attacked(self, side):
+        kings = self.pieces[side * 6 + KING]
+        return not kings or bool(self._attacked_by(side ^ 1) & kings)
+
+    # ── bitboards ─────────────────────────────────────────────────
+    def _sync_bitboards(self):
+        squares = self.squares
+        self.pieces   = array("Q", [0]) * 12
+        self.occupied = array("Q", [0]) * 2
+        self.zobrist_key = 0
+        for sq, code in enumerate(squares):
+            if code:
+                self.pieces[CODE_INDEX[code]] |= 1 << sq
+                self.occupied[code >> 3] |= 1 << sq
+                self.zobrist_key ^= CODE_KEYS[code][sq]
+
+        # attack set of the piece on every square, plus the per-colour union
+        # rebuilt lazily from it once something of that colour changed
+        occupied = self.occupied[WHITE] | self.occupied[BLACK]
+        self.attacks_from = array("Q", [0]) * 64
+        for sq in scan(occupied):
+            code = squares[sq]
+            self.attacks_from[sq] = piece_attacks((code & 7) - 1, code >> 3, sq, occupied)
+        self.attack_map = [None, None]
+        self._dirty_ranks = 0xFF
+        self._fen_rows = self._fen_cache = self._codes_cache = self._legal_cache = None
+
+    def _place(self, sq, code):
+        """Put *code* (0 for empty) on *sq*, keeping bitboards and attack maps in step."""
+        squares = self.squares
+        old = squares[sq]
+        if old == code:
+            return
+        bit = 1 << sq
+        pieces, occupied, attacks_from = self.pieces, self.occupied, self.attacks_from
+        if old:
+            color = old >> 3
+            pieces[CODE_INDEX[old]] ^= bit
+            occupied[color] ^= bit
+            self.zobrist_key ^= CODE_KEYS[old][sq]
+            attacks_from[sq] = 0
+            self.attack_map[color] = None
+        squares[sq] = code
+        self._dirty_ranks |= 1 << (sq >> 3)
+        occ = occupied[WHITE] | occupied[BLACK]
+        if code:
+            color = code >> 3
+            pieces[CODE_INDEX[code]] |= bit
+            occupied[color] |= bit
+            occ |= bit
+            self.zobrist_key ^= CODE_KEYS[code][sq]
+            attacks_from[sq] = piece_attacks((code & 7) - 1, color, sq, occ)
+            self.attack_map[color] = None
+        if not old or not code:
+            self._refresh_sliders(sq, occ)
+
+    def _refresh_sliders(self, sq, occupied):
+        """Recompute every slider whose line runs through *sq*."""
+        p, w, b = self.pieces, WHITE * 6, BLACK * 6
+        diagonal   = p[w + BISHOP] | p[w + QUEEN] | p[b + BISHOP] | p[b + QUEEN]
+        orthogonal = p[w + ROOK] | p[w + QUEEN] | p[b + ROOK] | p[b + QUEEN]
+        seen = ((bishop_attacks(sq, occupied) & diagonal) |
+                (rook_attacks(sq, occupied) & orthogonal))
+        squares, attacks_from, attack_map = self.squares, self.attacks_from, self.attack_map
+        for s in scan(seen):
+            code = squares[s]
+            attacks_from[s] = piece_attacks((code & 7) - 1, code >> 3, s, occupied)
+            attack_map[code >> 3] = None
+
+    def _attacked_by(self, color):
+        amap = self.attack_map[color]
+        if amap is None:
+            amap = 0
+            attacks_from = self.attacks_from
+            for sq in scan(self.occupied[color]):
+                amap |= attacks_from[sq]
+            self.attack_map[color] = amap
+        return amap
+
+    def _targets(self, sq):
+        """Pseudo-legal destination bitboard of the piece on *sq* (no castling)."""
+        code = self.squares[sq]
+        color, kind = code >> 3, (code & 7) - 1
+        own = self.occupied[color]
+        enemy = self.occupied[color ^ 1]
+        occupied = own | enemy
+
+        if kind == PAWN:
+            captures = enemy
+            # only the side that did not just double-push may take en passant
+            ep = self.ep_square
+            if ep is not None and ep >> 3 == (5 if color == WHITE else 2):
+                captures |= 1 << ep
+            targets = PAWN_ATTACKS[color][sq] & captures
+            step = 8 if color == WHITE else -8
+            one = sq + step
+            if 0 <= one < 64 and not occupied >> one & 1:
+                targets |= 1 << one
+                start_row = 1 if color == WHITE else 6
+                if sq >> 3 == start_row and not occupied >> (one + step) & 1:
+                    targets |= 1 << (one + step)
+            return targets
+        if kind == KNIGHT:
+            return KNIGHT_ATTACKS[sq] & ~own
+        if kind == BISHOP:
+            return bishop_attacks(sq, occupied) & ~own
+        if kind == ROOK:
+            return rook_attacks(sq, occupied) & ~own
+        if kind == QUEEN:
+            return (bishop_attacks(sq, occupied) | rook_attacks(sq, occupied)) & ~own
+        return KING_ATTACKS[sq] & ~own
+
+    def _castling_targets(self, king_sq, side):
+        """Castling squares still open to the king on *king_sq*, checks are left to _castling_legal."""
+        if king_sq != (4 if side == WHITE else 60):
+            return 0
+        occupied = self.occupied[WHITE] | self.occupied[BLACK]
+        rooks = self.pieces[side * 6 + ROOK]
+        targets = 0
+        for rook_sq, dest, between in CASTLING_PATHS[side]:
+            if self.castling & CASTLE_LOST[rook_sq] and rooks >> rook_sq & 1 and not occupied & between:
+                targets |= 1 << dest
+        return targets
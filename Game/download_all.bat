@@ -1,4 +1,4 @@
-pip install pygame
-pip install termcolor
-pip install CTkMessagebox
-pip install cryptography
+pip install pygame
+pip install termcolor
+pip install CTkMessagebox
+pip install cryptography
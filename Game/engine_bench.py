@@ -0,0 +1,179 @@
+"""
+Benchmark of ChessEngine's own overhead, measured against fake_engine.py.
+
+    python engine_bench.py                          fake engine, instant answers
+    python engine_bench.py --per-depth 0.001        fake engine that "searches" a little
+    python engine_bench.py --engine stockfish/stockfish.exe --depth 8
+    python engine_bench.py --json bench.json        also write the numbers for CI
+
+The fake engine answers at once with deterministic lines, so what is left
+is the wrapper: process spawn and UCI handshake, pool checkout, python-chess
+parsing and SAN conversion.  Every benchmark reports queries per second and
+latency percentiles; the analysis cache, opening book and tablebases are
+off unless --cache is given, so each query really reaches the engine.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import wait
+
+import chess
+
+from ChessEngine import ChessEngine, EnginePool
+
+FAKE_ENGINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_engine.py")
+
+
+def sample_games(count, plies, seed=1):
+    """*count* reproducible games of up to *plies* moves, as lists of UCI strings."""
+    rng, games = random.Random(seed), []
+    for _ in range(count):
+        board, moves = chess.Board(), []
+        while len(moves) < plies and not board.is_game_over():
+            move = rng.choice(sorted(board.legal_moves, key=lambda m: m.uci()))
+            moves.append(move.uci())
+            board.push(move)
+        games.append(moves)
+    return games
+
+
+def positions(games):
+    """(fen, one legal move) for every position of *games* that has a move."""
+    out = []
+    for moves in games:
+        board = chess.Board()
+        for uci in moves:
+            out.append((board.fen(), uci))
+            board.push_uci(uci)
+    return out
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def summarise(name, latencies, elapsed, queries=None):
+    latencies = sorted(latencies)
+    queries = queries or len(latencies)
+    row = {"n": queries, "qps": queries / max(elapsed, 1e-9),
+           "p50_ms": percentile(latencies, 50) * 1000, "p90_ms": percentile(latencies, 90) * 1000,
+           "p99_ms": percentile(latencies, 99) * 1000, "max_ms": latencies[-1] * 1000 if latencies else 0.0}
+    print(f"{name:<24} {row['n']:>6} {row['qps']:>10,.1f} q/s   p50 {row['p50_ms']:8.2f}  "
+          f"p90 {row['p90_ms']:8.2f}  p99 {row['p99_ms']:8.2f}  max {row['max_ms']:8.2f} ms")
+    return row
+
+
+def timed(calls):
+    """Run every zero-argument callable in turn -> (latencies, total seconds)."""
+    latencies, start = [], time.perf_counter()
+    for call in calls:
+        t = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - t)
+    return latencies, time.perf_counter() - start
+
+
+# ── benchmarks ───────────────────────────────────────────────────
+def bench_spawn(engine, n):
+    pool = EnginePool(engine.stockfish_path, size=1)
+
+    def spawn():
+        pool._discard(pool._spawn())
+
+    return timed([spawn] * n)
+
+
+def bench_game_loop(engine, games):
+    """
+    What AnalysisPage does: every ply of a game submitted through
+    analyse_async at once and collected as the pool gets through them.
+    The latency is per game, the rate per ply.
+    """
+    latencies, plies, start = [], 0, time.perf_counter()
+    for moves in games:
+        t = time.perf_counter()
+        board, futures = chess.Board(), [engine.analyse_async(chess.Board())]
+        for uci in moves:
+            board.push_uci(uci)
+            futures.append(engine.analyse_async(board))
+        wait(futures)
+        for future in futures:
+            future.result()
+        latencies.append(time.perf_counter() - t)
+        plies += len(futures)
+    return latencies, time.perf_counter() - start, plies
+
+
+def run(engine, args):
+    games = sample_games(args.games, args.plies)
+    sample = positions(games)[:args.queries]
+    results = {}
+
+    # one throwaway query so the pool is warm before anything is timed
+    engine.evaluate_position(chess.STARTING_FEN)
+
+    lat, total = bench_spawn(engine, args.spawns)
+    results["spawn+handshake"] = summarise("spawn+handshake", lat, total)
+
+    lat, total = timed([lambda fen=fen: engine.get_best_moves(fen, 3) for fen, _ in sample])
+    results["get_best_moves(3)"] = summarise("get_best_moves(3)", lat, total)
+
+    lat, total = timed([lambda fen=fen: engine.evaluate_position(fen) for fen, _ in sample])
+    results["evaluate_position"] = summarise("evaluate_position", lat, total)
+
+    lat, total = timed([lambda fen=fen, uci=uci: engine.evaluate_move(fen, uci) for fen, uci in sample])
+    results["evaluate_move"] = summarise("evaluate_move", lat, total)
+
+    lat, total = timed([lambda fen=fen: engine.analyse_async(fen).result() for fen, _ in sample])
+    results["analyse_async"] = summarise("analyse_async", lat, total)
+
+    lat, total = timed([lambda moves=moves: engine.evaluate_game(moves) for moves in games])
+    results["evaluate_game (plies)"] = summarise("evaluate_game (plies)", lat, total,
+                                                 sum(len(m) for m in games))
+
+    lat, total, plies = bench_game_loop(engine, games)
+    results["game loop (plies)"] = summarise(f"game loop x{args.workers} (plies)", lat, total, plies)
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark ChessEngine's plumbing")
+    ap.add_argument("--engine", help="a real UCI binary instead of fake_engine.py")
+    ap.add_argument("--per-depth", type=float, default=0.0, help="fake engine seconds per depth")
+    ap.add_argument("--depth", type=int, default=10)
+    ap.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                    help="pool size, as AnalysisPage picks it")
+    ap.add_argument("--games", type=int, default=5)
+    ap.add_argument("--plies", type=int, default=40)
+    ap.add_argument("--queries", type=int, default=100, help="positions for the single-query benchmarks")
+    ap.add_argument("--spawns", type=int, default=5)
+    ap.add_argument("--cache", action="store_true", help="measure with a fresh analysis cache")
+    ap.add_argument("--json", help="write the results to this file")
+    args = ap.parse_args(argv)
+
+    command = args.engine or [sys.executable, FAKE_ENGINE, "--per-depth", str(args.per_depth)]
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = ChessEngine(command, depth=args.depth, pool_size=args.workers,
+                             cache_path=os.path.join(tmp, "cache.db") if args.cache else None,
+                             book_path=None, syzygy_path=None)
+        print(f"engine: {command}, depth {args.depth}, {args.workers} worker(s)"
+              f"{', cache on' if args.cache else ''}\n")
+        results = run(engine, args)
+        engine.pool.close()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"engine": command, "depth": args.depth, "workers": args.workers,
+                       "cache": args.cache, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+A deterministic stand-in for Stockfish that speaks enough UCI for ChessEngine.
+
+    python fake_engine.py                      answer every "go" at once
+    python fake_engine.py --per-depth 0.01     take 10 ms per depth, like a real search
+
+It does no searching at all: the moves are the legal ones in UCI order and
+the score is a hash of the position, so every run sees the same numbers
+and a benchmark measures ChessEngine's own plumbing -- spawning, the UCI
+handshake, python-chess parsing, SAN conversion -- instead of Stockfish.
+It honours depth, nodes, movetime, infinite, MultiPV, stop, ponder and
+ponderhit; every depth counts as NODES_PER_DEPTH nodes, so "go nodes N"
+stops at the last depth that fits in N (depth 1 at the least).
+"""
+import argparse
+import queue
+import sys
+import threading
+import time
+import zlib
+
+import chess
+
+OPTIONS = [
+    "option name Threads type spin default 1 min 1 max 1024",
+    "option name Hash type spin default 16 min 1 max 33554432",
+    "option name MultiPV type spin default 1 min 1 max 500",
+    "option name Skill Level type spin default 20 min 0 max 20",
+    "option name UCI_LimitStrength type check default false",
+    "option name UCI_Elo type spin default 1320 min 1320 max 3190",
+    "option name Ponder type check default false",
+]
+DEFAULT_DEPTH = 10        # for "go movetime/wtime ..." without a depth or nodes
+NODES_PER_DEPTH = 1000
+
+
+def out(line):
+    sys.stdout.write(line + "\n")
+    sys.stdout.flush()
+
+
+def parse_go(parts):
+    """UCI "go" arguments -> {"depth", "nodes": int|None, "movetime": seconds|None, "infinite", "ponder"}."""
+    go = {"depth": None, "nodes": None, "movetime": None,
+          "infinite": "infinite" in parts, "ponder": "ponder" in parts}
+    for name in ("depth", "nodes", "movetime"):
+        if name in parts:
+            value = int(parts[parts.index(name) + 1])
+            go[name] = value / 1000 if name == "movetime" else value
+    return go
+
+
+class FakeEngine:
+    def __init__(self, per_depth=0.0):
+        self.per_depth = per_depth
+        self.board     = chess.Board()
+        self.multipv   = 1
+        self.commands  = queue.Queue()
+        self.deferred  = []               # commands that arrived mid-search
+
+    def read_stdin(self):
+        for line in sys.stdin:
+            self.commands.put(line.strip())
+        self.commands.put("quit")
+
+    def run(self):
+        threading.Thread(target=self.read_stdin, daemon=True).start()
+        while True:
+            line = self.deferred.pop(0) if self.deferred else self.commands.get()
+            parts = line.split()
+            if not parts:
+                continue
+            cmd = parts[0]
+            if cmd == "uci":
+                out("id name FakeEngine")
+                out("id author Game")
+                for option in OPTIONS:
+                    out(option)
+                out("uciok")
+            elif cmd == "isready":
+                out("readyok")
+            elif cmd == "setoption" and "value" in parts and parts[2:parts.index("value")] == ["MultiPV"]:
+                self.multipv = int(parts[parts.index("value") + 1])
+            elif cmd == "position":
+                self.set_position(parts)
+            elif cmd == "go":
+                self.go(parse_go(parts))
+            elif cmd == "quit":
+                return
+            # setoption for anything else, ucinewgame, stray stop/ponderhit: nothing to do
+
+    def set_position(self, parts):
+        moves = parts.index("moves") if "moves" in parts else len(parts)
+        self.board = chess.Board() if parts[1] == "startpos" else chess.Board(" ".join(parts[2:moves]))
+        for uci in parts[moves + 1:]:
+            self.board.push_uci(uci)
+
+    def poll(self):
+        """'stop', 'ponderhit' or None; answers isready and keeps anything else for later."""
+        while True:
+            try:
+                line = self.commands.get_nowait()
+            except queue.Empty:
+                return None
+            if line == "isready":
+                out("readyok")
+            elif line in ("stop", "ponderhit", "quit"):
+                if line == "quit":
+                    self.deferred.append(line)
+                    return "stop"
+                return line
+            else:
+                self.deferred.append(line)
+
+    def go(self, go):
+        board = self.board
+        moves = sorted(board.legal_moves, key=lambda m: m.uci())
+        if not moves:
+            out("info depth 0 score " + ("mate 0" if board.is_check() else "cp 0"))
+            out("bestmove (none)")
+            return
+
+        waiting = go["infinite"] or go["ponder"]           # only "stop"/"ponderhit" end these
+        if go["nodes"]:                                     # the last depth that fits in the budget
+            target = min(go["depth"] or go["nodes"], max(1, go["nodes"] // NODES_PER_DEPTH))
+        else:
+            target = go["depth"] or (1000 if go["infinite"] and self.per_depth else DEFAULT_DEPTH)
+        start, depth = time.perf_counter(), 0
+        base = zlib.crc32(board.fen().encode()) % 200 - 100
+        while True:
+            signal = self.poll()
+            if signal == "stop":
+                break
+            if signal == "ponderhit":
+                waiting, start = False, time.perf_counter()
+            if depth < target:
+                depth += 1
+                if self.per_depth:
+                    time.sleep(self.per_depth)
+                nodes, elapsed = depth * NODES_PER_DEPTH, time.perf_counter() - start
+                nps = int(nodes / elapsed) if elapsed else 0
+                for k, move in enumerate(moves[:self.multipv]):
+                    pv = [move] + self.reply(move)
+                    out(f"info depth {depth} seldepth {depth} multipv {k + 1} score cp {base - 7 * k} "
+                        f"nodes {nodes} nps {nps} time {int(elapsed * 1000)} "
+                        f"pv {' '.join(m.uci() for m in pv)}")
+            if waiting:
+                if depth >= target:
+                    time.sleep(0.001)                      # idle until told, without spinning
+                continue
+            if depth >= target or (go["movetime"] and time.perf_counter() - start >= go["movetime"]):
+                break
+
+        ponder = self.reply(moves[0])
+        out(f"bestmove {moves[0].uci()}" + (f" ponder {ponder[0].uci()}" if ponder else ""))
+
+    def reply(self, move):
+        self.board.push(move)
+        replies = sorted(self.board.legal_moves, key=lambda m: m.uci())
+        self.board.pop()
+        return replies[:1]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Deterministic fake UCI engine")
+    ap.add_argument("--per-depth", type=float, default=0.0, help="seconds spent on each depth")
+    args = ap.parse_args(argv)
+    FakeEngine(args.per_depth).run()
+
+
+if __name__ == "__main__":
+    main()
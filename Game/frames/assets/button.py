@@ -1,80 +1,80 @@
-import pygame
-
-class Button():
-	def __init__(self, image, pos, text_input, font, base_color, hovering_color):
-		self.image = image
-		self.x_pos = pos[0]
-		self.y_pos = pos[1]
-		self.font = font
-		self.base_color, self.hovering_color = base_color, hovering_color
-		self.text_input = text_input
-		self.text = self.font.render(self.text_input, True, self.base_color)
-		if self.image is None:
-			self.image = self.text
-		self.rect = self.image.get_rect(center=(self.x_pos, self.y_pos))
-		self.text_rect = self.text.get_rect(center=(self.x_pos, self.y_pos))
-
-	def update(self, screen):
-		if self.image is not None:
-			screen.blit(self.image, self.rect)
-		screen.blit(self.text, self.text_rect)
-
-	def checkForInput(self, position):
-		if position[0] in range(self.rect.left, self.rect.right) and position[1] in range(self.rect.top, self.rect.bottom):
-			return True
-		return False
-
-	def changeColor(self, position):
-		if position[0] in range(self.rect.left, self.rect.right) and position[1] in range(self.rect.top, self.rect.bottom):
-			self.text = self.font.render(self.text_input, True, self.hovering_color)
-		else:
-			self.text = self.font.render(self.text_input, True, self.base_color)
-    
-		
-class RadioButton(pygame.sprite.Sprite):
-    def __init__(self, x, y, w, h, font, text):
-        super().__init__() 
-        self.text = text
-        text_surf = font.render(text, True, (0, 0, 0))
-        self.button_image = pygame.Surface((w, h))
-        self.button_image.fill((96, 96, 96))
-        self.button_image.blit(text_surf, text_surf.get_rect(center=(w // 2, h // 2)))
-        
-        self.hover_image = pygame.Surface((w, h))
-        self.hover_image.fill((96, 96, 96))
-        self.hover_image.blit(text_surf, text_surf.get_rect(center=(w // 2, h // 2)))
-        pygame.draw.rect(self.hover_image, (96, 196, 96), self.hover_image.get_rect(), 3)
-        
-        self.clicked_image = pygame.Surface((w, h))
-        self.clicked_image.fill((96, 196, 96))
-        self.clicked_image.blit(text_surf, text_surf.get_rect(center=(w // 2, h // 2)))
-
-        self.image = self.button_image
-        self.rect = pygame.Rect(x, y, w, h)
-        self.clicked = False
-        self.buttons = None
-
-    def get_text(self):
-        return self.text
-
-    def setRadioButtons(self, buttons):
-        self.buttons = buttons
-
-    def update(self, event_list):
-        hover = self.rect.collidepoint(pygame.mouse.get_pos())
-        for event in event_list:
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if hover and event.button == 1:
-                    # Uncheck all in the group
-                    for rb in self.buttons:
-                        rb.clicked = False
-                    # Check this one
-                    self.clicked = True
-        
-        # Change image based on state
-        if self.clicked:
-            self.image = self.clicked_image
-        elif hover:
-            self.image = self.hover_image
-        else:
-            self.image = self.button_image
+import pygame
+
+class Button():
+	def __init__(self, image, pos, text_input, font, base_color, hovering_color):
+		self.image = image
+		self.x_pos = pos[0]
+		self.y_pos = pos[1]
+		self.font = font
+		self.base_color, self.hovering_color = base_color, hovering_color
+		self.text_input = text_input
+		self.text = self.font.render(self.text_input, True, self.base_color)
+		if self.image is None:
+			self.image = self.text
+		self.rect = self.image.get_rect(center=(self.x_pos, self.y_pos))
+		self.text_rect = self.text.get_rect(center=(self.x_pos, self.y_pos))
+
+	def update(self, screen):
+		if self.image is not None:
+			screen.blit(self.image, self.rect)
+		screen.blit(self.text, self.text_rect)
+
+	def checkForInput(self, position):
+		if position[0] in range(self.rect.left, self.rect.right) and position[1] in range(self.rect.top, self.rect.bottom):
+			return True
+		return False
+
+	def changeColor(self, position):
+		if position[0] in range(self.rect.left, self.rect.right) and position[1] in range(self.rect.top, self.rect.bottom):
+			self.text = self.font.render(self.text_input, True, self.hovering_color)
+		else:
+			self.text = self.font.render(self.text_input, True, self.base_color)
+    
+		
+class RadioButton(pygame.sprite.Sprite):
+    def __init__(self, x, y, w, h, font, text):
+        super().__init__() 
+        self.text = text
+        text_surf = font.render(text, True, (0, 0, 0))
+        self.button_image = pygame.Surface((w, h))
+        self.button_image.fill((96, 96, 96))
+        self.button_image.blit(text_surf, text_surf.get_rect(center=(w // 2, h // 2)))
+        
+        self.hover_image = pygame.Surface((w, h))
+        self.hover_image.fill((96, 96, 96))
+        self.hover_image.blit(text_surf, text_surf.get_rect(center=(w // 2, h // 2)))
+        pygame.draw.rect(self.hover_image, (96, 196, 96), self.hover_image.get_rect(), 3)
+        
+        self.clicked_image = pygame.Surface((w, h))
+        self.clicked_image.fill((96, 196, 96))
+        self.clicked_image.blit(text_surf, text_surf.get_rect(center=(w // 2, h // 2)))
+
+        self.image = self.button_image
+        self.rect = pygame.Rect(x, y, w, h)
+        self.clicked = False
+        self.buttons = None
+
+    def get_text(self):
+        return self.text
+
+    def setRadioButtons(self, buttons):
+        self.buttons = buttons
+
+    def update(self, event_list):
+        hover = self.rect.collidepoint(pygame.mouse.get_pos())
+        for event in event_list:
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if hover and event.button == 1:
+                    # Uncheck all in the group
+                    for rb in self.buttons:
+                        rb.clicked = False
+                    # Check this one
+                    self.clicked = True
+        
+        # Change image based on state
+        if self.clicked:
+            self.image = self.clicked_image
+        elif hover:
+            self.image = self.hover_image
+        else:
+            self.image = self.button_image
@@ -0,0 +1,69 @@
+"""
+Polyglot opening book in front of the engine.
+
+The .bin file is opened through chess.polyglot's memory-mapped reader,
+so even a large book costs no load time and only the pages a lookup
+touches are read.  Without a book file every lookup simply misses and
+the engine searches as before.
+"""
+import os
+import random
+import threading
+
+import chess
+import chess.polyglot
+
+OPENING_BOOK = "books/book.bin"
+
+
+class OpeningBook:
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: str = OPENING_BOOK, rng: random.Random = None):
+        self.path   = path
+        self.rng    = rng or random.Random()
+        self.hits = self.misses = 0
+        self._lock  = threading.Lock()
+        self._reader = chess.polyglot.open_reader(path) if os.path.isfile(path) else None
+
+    @classmethod
+    def shared(cls, path: str = OPENING_BOOK):
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path)
+            return cls._shared[path]
+
+    def __bool__(self):
+        return self._reader is not None
+
+    def moves(self, board: chess.Board):
+        """[(move, weight), ...] for *board*, heaviest first; [] when out of book."""
+        if self._reader is None:
+            return []
+        with self._lock:
+            entries = sorted(self._reader.find_all(board), key=lambda e: e.weight, reverse=True)
+            if entries:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return [(entry.move, entry.weight) for entry in entries]
+
+    def move(self, board: chess.Board, weighted: bool = False):
+        """
+        A book move for *board*, or None.  The heaviest one by default;
+        with *weighted* a random one in proportion to its weight, so a bot
+        does not play the same opening every game.
+        """
+        entries = self.moves(board)
+        if not entries:
+            return None
+        if not weighted:
+            return entries[0][0]
+        moves, weights = zip(*entries)
+        return self.rng.choices(moves, weights=weights)[0]
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
@@ -1,195 +1,329 @@
-
-import os, threading, traceback
-import pygame, chess
-from base_page import BasePage
-from frames.assets.button import Button
-from ChessEngine import ChessEngine
-
-
-def _nice_score_white(score_obj: chess.engine.PovScore) -> str:
-    """Positive = White is better, negative = Black is better."""
-    if score_obj.is_mate():
-        side = "White" if score_obj.mate() > 0 else "Black"
-        return f"{side} mates in {abs(score_obj.mate())}"
-    cp = score_obj.score()
-    return "N/A" if cp is None else f"{cp/100:.2f}"
-
-def _load_imgs(folder: str):
-    imgs = {}
-    for col in ("white", "black"):
-        for pc in ("king","queen","rook","bishop","knight","pawn"):
-            pth = os.path.join(folder,f"{col}_{pc}.png")
-            if os.path.isfile(pth):
-                imgs[f"{col}_{pc}"] = pygame.transform.scale(
-                    pygame.image.load(pth), (100,100))
-    return imgs
-
-def _piece_key(sym: str):
-    col = "white" if sym[-1]=="W" else "black"
-    name = {"K":"king","Q":"queen","R":"rook",
-            "B":"bishop","N":"knight","P":"pawn"}[sym[0].upper()]
-    return f"{col}_{name}"
-
-
-class AnalysisPage(BasePage):
-    LIGHT, DARK = (240,217,181), (181,136,99)
-
-    ROW_H        = 22
-    LIST_TOP_Y   = 240
-    LIST_X       = 820
-    LIST_HEIGHT  = 750 - LIST_TOP_Y    
-
-    def __init__(self, manager, move_history, player_color,
-                 result, client, key, engine_depth=14):
-        super().__init__(manager)
-
-        self.move_history = move_history         
-        self.player_color = (player_color or "white").lower()
-        self.result       = result
-        self.client, self.key = client, key
-
-        self.board_px, self.sq_px = 800, 100
-        self.flip_board = self.player_color.startswith("b")
-        self.images     = _load_imgs("chess pieces")
-
-        font = lambda s: pygame.font.SysFont(None, s)
-        self.f_sm, self.f_md, self.f_lg = map(font,(26,30,42))
-
-        self.btn_left  = Button(None,(820,170),"<",   self.f_lg,"White","Green")
-        self.btn_right = Button(None,(950,170),">",   self.f_lg,"White","Green")
-        self.btn_back  = Button(None,(1030,780),"BACK",self.f_lg,"White","Red")
-
-        self.board  = chess.Board()
-        self.index  = len(move_history)                 
-        n           = len(move_history)+1
-        self.evals  = ["…"]*n
-        self.best   = ["…"]*n
-
-        self.rows_visible = self.LIST_HEIGHT // self.ROW_H
-        self.list_top_idx = max(0, self.index - self.rows_visible + 1)
-
-        self.depth  = engine_depth
-        self.engine = ChessEngine(depth=self.depth)
-
-        threading.Thread(target=self._analyse, daemon=True).start()
-
-    def _analyse(self):
-        try:
-            eng   = self.engine._open()
-            limit = chess.engine.Limit(depth=self.depth)
-            tmp   = chess.Board()
-
-            for ply in range(len(self.move_history)+1):
-                info           = eng.analyse(tmp, limit)
-                self.evals[ply] = _nice_score_white(info["score"].white())
-                pv = info.get("pv")
-                self.best[ply] = tmp.san(pv[0]) if pv else "—"
-
-                if ply < len(self.move_history):
-                    frm,to,_ = self.move_history[ply]
-                    tmp.push(chess.Move.from_uci(self._tuple2uci((frm,to))))
-        except Exception as e:
-            print("[AnalysisPage] Engine error:", e)
-            traceback.print_exc()
-            self.evals = ["N/A"]*len(self.evals)
-            self.best  = ["—"] *len(self.best)
-        finally:
-            try: eng.quit()
-            except: pass
-
-    @staticmethod
-    def _tuple2uci(move):
-        (r1,c1),(r2,c2) = move
-        s = lambda r,c: chess.square(c,r)
-        return chess.square_name(s(r1,c1))+chess.square_name(s(r2,c2))
-
-    def _board_to_gui(self,pos):
-        r,c=pos
-        return (r if self.flip_board else 7-r, c)
-
-    def _ensure_visible(self):
-        """Auto-scroll so current ply stays in view."""
-        if self.index < self.list_top_idx:
-            self.list_top_idx = self.index
-        elif self.index >= self.list_top_idx + self.rows_visible:
-            self.list_top_idx = self.index - self.rows_visible + 1
-
-    def _scroll(self, delta_rows: int):
-        max_top = max(0, len(self.move_history) - self.rows_visible)
-        self.list_top_idx = max(0, min(max_top, self.list_top_idx + delta_rows))
-
-    def _jump(self, idx):
-        idx = max(0, min(len(self.move_history), idx))
-        if idx == self.index: return
-        self.board = chess.Board()
-        for frm,to,_ in self.move_history[:idx]:
-            self.board.push(chess.Move.from_uci(self._tuple2uci((frm,to))))
-        self.index = idx
-        self._ensure_visible()
-
-    def handle_events(self, evts):
-        mouse = pygame.mouse.get_pos()
-        for e in evts:
-            if e.type == pygame.MOUSEBUTTONDOWN:
-                if self.btn_back.checkForInput(mouse):
-                    self.manager.set_current_page("MainMenuPage",
-                                                  client=self.client,key=self.key)
-                    return
-                if self.btn_left.checkForInput(mouse):  self._jump(self.index-1)
-                if self.btn_right.checkForInput(mouse): self._jump(self.index+1)
-
-            elif e.type == pygame.MOUSEWHEEL:
-                if mouse[0] >= self.LIST_X:
-                    self._scroll(-e.y)          
-                else:
-                    self._jump(self.index - e.y)
-
-            elif e.type == pygame.KEYDOWN:
-                if e.key in (pygame.K_LEFT,pygame.K_a):  self._jump(self.index-1)
-                elif e.key in (pygame.K_RIGHT,pygame.K_d): self._jump(self.index+1)
-                elif e.key == pygame.K_PAGEUP:           self._scroll(-self.rows_visible)
-                elif e.key == pygame.K_PAGEDOWN:         self._scroll(self.rows_visible)
-
-    def draw(self):
-        self.screen.fill((25,25,25))
-
-        for gr in range(8):
-            br = gr if self.flip_board else 7-gr
-            for c in range(8):
-                pygame.draw.rect(
-                    self.screen,
-                    self.LIGHT if (br+c)%2==0 else self.DARK,
-                    (c*self.sq_px,gr*self.sq_px,self.sq_px,self.sq_px))
-
-        for sq in chess.SQUARES:
-            p=self.board.piece_at(sq)
-            if not p: continue
-            key=_piece_key(p.symbol()+("W" if p.color else "B"))
-            r,c = chess.square_rank(sq), chess.square_file(sq)
-            gr,gc = self._board_to_gui((r,c))
-            self.screen.blit(self.images[key],
-                             (gc*self.sq_px, gr*self.sq_px))
-
-        y = self.LIST_TOP_Y
-        start = self.list_top_idx
-        end   = min(len(self.move_history), start + self.rows_visible)
-        for i in range(start, end):
-            frm,to,_ = self.move_history[i]
-            colour = (200,200,30) if i+1==self.index else (230,230,230)
-            txt = f"{i+1:>2}. {self._tuple2uci((frm,to))}"
-            self.screen.blit(self.f_sm.render(txt,True,colour),(self.LIST_X,y))
-            y += self.ROW_H
-
-        self.screen.blit(self.f_md.render(
-            f"Score: {self.evals[self.index]}",True,(255,255,255)),
-            (self.LIST_X,60))
-        self.screen.blit(self.f_md.render(
-            f"Best move: {self.best[self.index]}",True,(180,230,255)),
-            (self.LIST_X,90))
-
-        self.screen.blit(self.f_md.render(f"Result: {self.result}",
-                                          True,(255,255,255)), (10,750))
-        for b in (self.btn_left,self.btn_right,self.btn_back):
-            b.changeColor(pygame.mouse.get_pos()); b.update(self.screen)
-
-    def update(self): pass
+
+import os, threading, traceback
+from concurrent.futures import CancelledError
+import pygame, chess
+from base_page import BasePage
+from frames.assets.button import Button
+from ChessEngine import ChessEngine
+
+
+def _nice_score_white(score_obj: chess.engine.PovScore) -> str:
+    """Positive = White is better, negative = Black is better."""
+    if score_obj.is_mate():
+        side = "White" if score_obj.mate() > 0 else "Black"
+        return f"{side} mates in {abs(score_obj.mate())}"
+    cp = score_obj.score()
+    return "N/A" if cp is None else f"{cp/100:.2f}"
+
+def _nice_line_white(line: dict) -> str:
+    """The same text for a line from the server's analysis service."""
+    if line.get("mate") is not None:
+        side = "White" if line["mate"] > 0 else "Black"
+        return f"{side} mates in {abs(line['mate'])}"
+    cp = line.get("eval_cp")
+    return "N/A" if cp is None else f"{cp/100:.2f}"
+
+def _load_imgs(folder: str):
+    imgs = {}
+    for col in ("white", "black"):
+        for pc in ("king","queen","rook","bishop","knight","pawn"):
+            pth = os.path.join(folder,f"{col}_{pc}.png")
+            if os.path.isfile(pth):
+                imgs[f"{col}_{pc}"] = pygame.transform.scale(
+                    pygame.image.load(pth), (100,100))
+    return imgs
+
+def _piece_key(sym: str):
+    col = "white" if sym[-1]=="W" else "black"
+    name = {"K":"king","Q":"queen","R":"rook",
+            "B":"bishop","N":"knight","P":"pawn"}[sym[0].upper()]
+    return f"{col}_{name}"
+
+
+class AnalysisPage(BasePage):
+    LIGHT, DARK = (240,217,181), (181,136,99)
+
+    ROW_H        = 22
+    LIST_TOP_Y   = 240
+    LIST_X       = 820
+    LIST_HEIGHT  = 750 - LIST_TOP_Y    
+
+    def __init__(self, manager, move_history, player_color,
+                 result, client, key, engine_depth=14):
+        super().__init__(manager)
+
+        self.move_history = move_history         
+        self.player_color = (player_color or "white").lower()
+        self.result       = result
+        self.client, self.key = client, key
+
+        self.board_px, self.sq_px = 800, 100
+        self.flip_board = self.player_color.startswith("b")
+        self.images     = _load_imgs("chess pieces")
+
+        font = lambda s: pygame.font.SysFont(None, s)
+        self.f_sm, self.f_md, self.f_lg = map(font,(26,30,42))
+
+        self.btn_left  = Button(None,(820,170),"<",   self.f_lg,"White","Green")
+        self.btn_right = Button(None,(950,170),">",   self.f_lg,"White","Green")
+        self.btn_back  = Button(None,(1030,780),"BACK",self.f_lg,"White","Red")
+
+        self.board  = chess.Board()
+        self.index  = len(move_history)                 
+        n           = len(move_history)+1
+        self.evals  = ["…"]*n
+        self.best   = ["…"]*n
+        self.depths = [0]*n                             # depth behind evals[i]
+
+        self.rows_visible = self.LIST_HEIGHT // self.ROW_H
+        self.list_top_idx = max(0, self.index - self.rows_visible + 1)
+
+        # FEN of every ply, so workers can pick plies in any order
+        tmp = chess.Board()
+        self.fens = [tmp.fen()]
+        for frm,to,_ in move_history:
+            tmp.push(chess.Move.from_uci(self._tuple2uci((frm,to))))
+            self.fens.append(tmp.fen())
+
+        self.depth    = engine_depth
+        self.engine   = None            # local Stockfish, only if the server can't help
+        self.pending  = set()           # plies nobody has started yet
+        self.searches = {}              # ply -> in-flight future, cancelled on BACK
+        self.stream   = None            # deepening search on stream_ply
+        self.stream_ply = None
+        self.lock     = threading.Lock()
+        self.wake     = threading.Condition(self.lock)   # pending grew or BACK
+        self.running  = True
+
+        # the server's shared analysis service searches every ply once for
+        # all players; without a connection the plies are searched here
+        self.remote = bool(self.client) and not self.client.closed
+        if self.remote:
+            for ply, fen in enumerate(self.fens):
+                if not self.client.send_json({"type": "analyse_position", "fen": fen,
+                                              "request_id": ply}):
+                    self.remote = False
+                    break
+        if not self.remote:
+            self._start_local()
+
+    def _start_local(self):
+        """
+        One engine process per spare core, each worker keeps one busy,
+        plus one for the deepening search on the ply being looked at.
+        """
+        self.remote   = False
+        self.workers  = max(1, (os.cpu_count() or 2) - 1)
+        self.engine   = ChessEngine(depth=self.depth, pool_size=self.workers + 1)
+        with self.lock:
+            self.pending = {ply for ply, depth in enumerate(self.depths) if not depth}
+        self._follow()
+        for _ in range(self.workers):
+            threading.Thread(target=self._analyse, daemon=True).start()
+
+    def _next_ply(self):
+        """Claim the unanalysed ply closest to the one on screen."""
+        with self.lock:
+            # a ply the user skipped past may be handed back, so idle workers wait
+            while self.running and not self.pending:
+                self.wake.wait()
+            if not self.running:
+                return None
+            ply = min(self.pending, key=lambda p: (abs(p - self.index), p))
+            self.pending.discard(ply)
+            return ply
+
+    def _analyse(self):
+        while True:
+            ply = self._next_ply()
+            if ply is None: return
+            board = chess.Board(self.fens[ply])
+            with self.lock:
+                search = self.searches[ply] = self.engine.analyse_async(board)
+            try:
+                self._show(ply, board, search.result(), from_worker=True)
+            except CancelledError:
+                return
+            except Exception as e:
+                print("[AnalysisPage] Engine error:", e)
+                traceback.print_exc()
+                self.evals[ply], self.best[ply] = "N/A", "—"
+            finally:
+                with self.lock: self.searches.pop(ply, None)
+
+    def _show(self, ply, board, info, from_worker=False):
+        """
+        Put a result on screen unless a deeper one is already there.
+        A stream reaching full depth is left to finish, so it gets cached.
+        """
+        depth = info.get("depth", self.depth)
+        with self.lock:
+            if depth < self.depths[ply]: return
+            self.depths[ply] = depth
+            if "tablebase" in info:             # exact, from the Syzygy tables
+                wdl = info["tablebase"] if board.turn == chess.WHITE else -info["tablebase"]
+                self.evals[ply] = ("White wins" if wdl == 2 else "Black wins" if wdl == -2
+                                   else "Draw") + " (tablebase)"
+            else:
+                self.evals[ply] = _nice_score_white(info["score"].white())
+            pv = info.get("pv")
+            self.best[ply] = board.san(pv[0]) if pv else "—"
+            if from_worker and ply == self.stream_ply and depth >= self.depth and self.stream:
+                self.stream.cancel()            # a worker got there first
+
+    def _follow(self):
+        """
+        Stream a deepening search for the ply on screen so a rough score
+        shows at once, pre-empting the one for the ply the user left.
+        """
+        if self.engine is None: return
+        with self.lock:
+            if self.stream:
+                self.stream.cancel()
+                left = self.stream_ply
+                if self.depths[left] < self.depth and left not in self.searches:
+                    self.pending.add(left)      # back to the workers, full depth
+                    self.wake.notify()
+            self.stream = self.stream_ply = None
+            ply = self.index
+            if not self.running or self.depths[ply] >= self.depth: return
+            self.pending.discard(ply)
+            board = chess.Board(self.fens[ply])
+            self.stream_ply = ply
+            stream = self.stream = self.engine.stream_async(
+                board, lambda info: self._show(ply, board, info), interval=0.15)
+        # outside the lock: a search that already failed calls back right here
+        stream.add_done_callback(lambda f: self._stream_done(ply, f))
+
+    def _stream_done(self, ply, search):
+        if search.cancelled() or search.exception() is None: return
+        print("[AnalysisPage] Engine error:", search.exception())
+        with self.lock:
+            if self.running and self.depths[ply] < self.depth:
+                self.pending.add(ply)
+                self.wake.notify()
+
+    def _stop(self):
+        with self.lock:
+            self.running = False
+            for search in self.searches.values(): search.cancel()
+            if self.stream: self.stream.cancel()
+            self.wake.notify_all()
+
+    @staticmethod
+    def _tuple2uci(move):
+        (r1,c1),(r2,c2) = move
+        s = lambda r,c: chess.square(c,r)
+        return chess.square_name(s(r1,c1))+chess.square_name(s(r2,c2))
+
+    def _board_to_gui(self,pos):
+        r,c=pos
+        return (r if self.flip_board else 7-r, c)
+
+    def _ensure_visible(self):
+        """Auto-scroll so current ply stays in view."""
+        if self.index < self.list_top_idx:
+            self.list_top_idx = self.index
+        elif self.index >= self.list_top_idx + self.rows_visible:
+            self.list_top_idx = self.index - self.rows_visible + 1
+
+    def _scroll(self, delta_rows: int):
+        max_top = max(0, len(self.move_history) - self.rows_visible)
+        self.list_top_idx = max(0, min(max_top, self.list_top_idx + delta_rows))
+
+    def _jump(self, idx):
+        idx = max(0, min(len(self.move_history), idx))
+        if idx == self.index: return
+        while len(self.board.move_stack) > idx:
+            self.board.pop()
+        while len(self.board.move_stack) < idx:
+            frm,to,_ = self.move_history[len(self.board.move_stack)]
+            self.board.push(chess.Move.from_uci(self._tuple2uci((frm,to))))
+        self.index = idx
+        self._ensure_visible()
+        self._follow()
+
+    def handle_events(self, evts):
+        mouse = pygame.mouse.get_pos()
+        for e in evts:
+            if e.type == pygame.MOUSEBUTTONDOWN:
+                if self.btn_back.checkForInput(mouse):
+                    self._stop()
+                    self.manager.set_current_page("MainMenuPage",
+                                                  client=self.client,key=self.key)
+                    return
+                if self.btn_left.checkForInput(mouse):  self._jump(self.index-1)
+                if self.btn_right.checkForInput(mouse): self._jump(self.index+1)
+
+            elif e.type == pygame.MOUSEWHEEL:
+                if mouse[0] >= self.LIST_X:
+                    self._scroll(-e.y)          
+                else:
+                    self._jump(self.index - e.y)
+
+            elif e.type == pygame.KEYDOWN:
+                if e.key in (pygame.K_LEFT,pygame.K_a):  self._jump(self.index-1)
+                elif e.key in (pygame.K_RIGHT,pygame.K_d): self._jump(self.index+1)
+                elif e.key == pygame.K_PAGEUP:           self._scroll(-self.rows_visible)
+                elif e.key == pygame.K_PAGEDOWN:         self._scroll(self.rows_visible)
+
+    def draw(self):
+        self.screen.fill((25,25,25))
+
+        for gr in range(8):
+            br = gr if self.flip_board else 7-gr
+            for c in range(8):
+                pygame.draw.rect(
+                    self.screen,
+                    self.LIGHT if (br+c)%2==0 else self.DARK,
+                    (c*self.sq_px,gr*self.sq_px,self.sq_px,self.sq_px))
+
+        for sq in chess.SQUARES:
+            p=self.board.piece_at(sq)
+            if not p: continue
+            key=_piece_key(p.symbol()+("W" if p.color else "B"))
+            r,c = chess.square_rank(sq), chess.square_file(sq)
+            gr,gc = self._board_to_gui((r,c))
+            self.screen.blit(self.images[key],
+                             (gc*self.sq_px, gr*self.sq_px))
+
+        y = self.LIST_TOP_Y
+        start = self.list_top_idx
+        end   = min(len(self.move_history), start + self.rows_visible)
+        for i in range(start, end):
+            frm,to,_ = self.move_history[i]
+            colour = (200,200,30) if i+1==self.index else (230,230,230)
+            txt = f"{i+1:>2}. {self._tuple2uci((frm,to))}"
+            self.screen.blit(self.f_sm.render(txt,True,colour),(self.LIST_X,y))
+            y += self.ROW_H
+
+        depth = self.depths[self.index]
+        refining = f"  (depth {depth})" if 0 < depth < self.depth else ""
+        self.screen.blit(self.f_md.render(
+            f"Score: {self.evals[self.index]}{refining}",True,(255,255,255)),
+            (self.LIST_X,60))
+        self.screen.blit(self.f_md.render(
+            f"Best move: {self.best[self.index]}",True,(180,230,255)),
+            (self.LIST_X,90))
+
+        self.screen.blit(self.f_md.render(f"Result: {self.result}",
+                                          True,(255,255,255)), (10,750))
+        for b in (self.btn_left,self.btn_right,self.btn_back):
+            b.changeColor(pygame.mouse.get_pos()); b.update(self.screen)
+
+    def update(self):
+        if not self.remote or not self.running: return
+        for pkt in self.client.poll():
+            if pkt.get("type") == "analysis_result":
+                ply, line = pkt.get("request_id"), pkt["lines"][0]
+                if not isinstance(ply, int) or not 0 <= ply < len(self.fens): continue
+                with self.lock:
+                    self.depths[ply] = line.get("depth") or self.depth
+                    self.evals[ply]  = _nice_line_white(line)
+                    self.best[ply]   = line.get("best") or "—"
+            elif pkt.get("type") == "analysis_error":
+                print("[AnalysisPage] Server analysis failed:", pkt.get("reason"))
+                self._start_local()             # the rest of the plies are searched here
+                return
+        if self.client.closed:
+            self._start_local()
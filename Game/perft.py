@@ -0,0 +1,186 @@
+"""
+Perft benchmark and correctness suite for ChessBoard's move generator.
+
+    python perft.py                         run the suite, report nodes/s
+    python perft.py --max-nodes 5000000     go deeper on every position
+    python perft.py --fen "<fen>" --depth 4 --divide
+    python perft.py --cross-check           compare every node with python-chess
+
+Expected counts are the published ones (chessprogramming.org and the
+Sedlak edge-case set), so the suite fails loudly when a change to
+bitboard.py or chess_board.py breaks castling, promotion or en passant.
+"""
+import argparse
+import sys
+import time
+
+from chess_board import ChessBoard
+
+
+# name, fen, node counts for depth 1, 2, 3, …
+POSITIONS = [
+    ("start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+     [20, 400, 8902, 197281, 4865609]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     [48, 2039, 97862, 4085603]),
+    ("position 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     [14, 191, 2812, 43238, 674624]),
+    ("position 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     [6, 264, 9467, 422333]),
+    ("position 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     [44, 1486, 62379, 2103487]),
+    ("position 6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     [46, 2079, 89890, 3894594]),
+    # en passant, castling and promotion edge cases
+    ("illegal ep 1", "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1",
+     [18, 92, 1670, 10138, 185429, 1134888]),
+    ("illegal ep 2", "8/8/4k3/8/2p5/8/B2P2K1/8 w - - 0 1",
+     [13, 102, 1266, 10276, 135655, 1015133]),
+    ("ep gives check", "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1",
+     [15, 126, 1928, 13931, 206379, 1440467]),
+    ("short castle check", "5k2/8/8/8/8/8/8/4K2R w K - 0 1",
+     [15, 66, 1198, 6399, 120330, 661072]),
+    ("long castle check", "3k4/8/8/8/8/8/8/R3K3 w Q - 0 1",
+     [16, 71, 1286, 7418, 141077, 803711]),
+    ("castling rights", "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1",
+     [26, 1141, 27826, 1274206]),
+    ("castling prevented", "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1",
+     [44, 1494, 50509, 1720476]),
+    ("promote out of check", "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1",
+     [11, 133, 1442, 19174, 266199, 3821001]),
+    ("discovered check", "8/8/1P2K3/8/2n5/1q6/8/5k2 b - - 0 1",
+     [29, 165, 5160, 31961, 1004658]),
+    ("promote to check", "4k3/1P6/8/8/8/8/K7/8 w - - 0 1",
+     [9, 40, 472, 2661, 38983, 217342]),
+    ("underpromote check", "8/P1k5/K7/8/8/8/8/8 w - - 0 1",
+     [6, 27, 273, 1329, 18135, 92683]),
+    ("self stalemate", "K1k5/8/P7/8/8/8/8/8 w - - 0 1",
+     [2, 6, 13, 63, 382, 2217]),
+    ("stalemate and mate 1", "8/k1P5/8/1K6/8/8/8/8 w - - 0 1",
+     [10, 25, 268, 926, 10857, 43261, 567584]),
+    ("stalemate and mate 2", "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1",
+     [37, 183, 6559, 23527, 811573, 3114998]),
+]
+
+
+def perft(board, depth):
+    """Number of leaf nodes *depth* plies below the current position."""
+    moves = list(board.legal_moves())
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for frm, to, promotion in moves:
+        board.push(frm, to, promotion or "q")
+        nodes += perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+
+def divide(board, depth):
+    """{uci: nodes} for every legal root move."""
+    out = {}
+    for frm, to, promotion in list(board.legal_moves()):
+        board.push(frm, to, promotion or "q")
+        out[to_uci(frm, to, promotion)] = perft(board, depth - 1)
+        board.pop()
+    return out
+
+
+def to_uci(frm, to, promotion=None):
+    sq = lambda pos: "abcdefgh"[pos[1]] + str(pos[0] + 1)
+    return sq(frm) + sq(to) + (promotion or "")
+
+
+def cross_check(board, depth):
+    """
+    Walk the tree next to python-chess and return None, or a description
+    of the first position whose legal moves differ.
+    """
+    import chess
+
+    reference = chess.Board(board.fen)
+    ours = {to_uci(*m) for m in board.legal_moves()}
+    theirs = {m.uci() for m in reference.legal_moves}
+    if ours != theirs:
+        return (f"{board.fen}\n  missing: {sorted(theirs - ours)}"
+                f"\n  extra:   {sorted(ours - theirs)}")
+    if depth <= 1:
+        return None
+    for frm, to, promotion in list(board.legal_moves()):
+        board.push(frm, to, promotion or "q")
+        problem = cross_check(board, depth - 1)
+        board.pop()
+        if problem:
+            return problem
+    return None
+
+
+def run_suite(max_nodes, check=False):
+    board = ChessBoard()
+    total_nodes, total_time, failures = 0, 0.0, 0
+    for name, fen, counts in POSITIONS:
+        for depth, expected in enumerate(counts, 1):
+            if expected > max_nodes:
+                break
+            board.set_fen(fen)
+            if check:
+                problem = cross_check(board, depth)
+                if problem:
+                    print(f"{name:<20} depth {depth}: differs from python-chess at\n  {problem}")
+                    failures += 1
+                    break
+
+            start = time.perf_counter()
+            nodes = perft(board, depth)
+            elapsed = time.perf_counter() - start
+            total_nodes += nodes
+            total_time += elapsed
+
+            status = "ok" if nodes == expected else f"FAIL (expected {expected})"
+            failures += nodes != expected
+            print(f"{name:<20} depth {depth}: {nodes:>10} nodes "
+                  f"{elapsed:8.2f}s {nodes / max(elapsed, 1e-9):>10,.0f} nps  {status}")
+
+    print(f"\n{total_nodes} nodes in {total_time:.2f}s -> "
+          f"{total_nodes / max(total_time, 1e-9):,.0f} nodes/s, {failures} failure(s)")
+    return failures
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Perft for ChessBoard")
+    ap.add_argument("--fen", help="run a single position instead of the suite")
+    ap.add_argument("--depth", type=int, default=3)
+    ap.add_argument("--divide", action="store_true", help="print node counts per root move")
+    ap.add_argument("--max-nodes", type=int, default=100_000,
+                    help="skip suite depths whose expected count is larger")
+    ap.add_argument("--cross-check", action="store_true",
+                    help="compare legal moves at every node with python-chess")
+    args = ap.parse_args(argv)
+
+    if not args.fen:
+        return 1 if run_suite(args.max_nodes, args.cross_check) else 0
+
+    board = ChessBoard()
+    board.set_fen(args.fen)
+    if args.cross_check:
+        problem = cross_check(board, args.depth)
+        print(problem or "matches python-chess")
+        if problem:
+            return 1
+
+    start = time.perf_counter()
+    if args.divide:
+        counts = divide(board, args.depth)
+        for uci in sorted(counts):
+            print(f"{uci}: {counts[uci]}")
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(board, args.depth)
+    elapsed = time.perf_counter() - start
+    print(f"depth {args.depth}: {nodes} nodes in {elapsed:.2f}s "
+          f"({nodes / max(elapsed, 1e-9):,.0f} nodes/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
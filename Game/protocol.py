@@ -0,0 +1,277 @@
+"""
+Message framing shared by the server and every page.
+
+Each message on the wire is a 5-byte header -- payload length (4 bytes,
+big-endian) and payload type (1 byte) -- followed by the payload:
+
+    PUBKEY   the server's PEM public key       first message of every connection
+    SESSION  RSA-OAEP encrypted session key    client's first message
+    SEALED   AES-256-GCM encrypted JSON        everything after that, both ways
+    JSON     plain JSON, UTF-8                 clients that skip the handshake
+
+RSA is used once per connection, to hand the server a fresh AES key;
+every message after it costs an AES-GCM seal or open, about a
+microsecond, instead of an RSA decryption on the server.
+
+A reader never has to guess where one message ends, so any number of
+messages may arrive in one recv and a message may span several.
+FrameDecoder buffers the bytes in one bytearray and hands payloads out as
+memoryviews into it, so nothing is copied or re-scanned on the way.
+"""
+import json
+import select
+import socket
+import struct
+import threading
+from collections import deque
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+HEADER = struct.Struct("!IB")      # payload length, payload type
+
+JSON, SESSION, PUBKEY, SEALED = 1, 2, 3, 4
+
+MAX_PAYLOAD = 16 << 20             # largest payload a decoder accepts by default
+RECV_SIZE   = 65536
+
+OAEP = padding.OAEP(mgf=padding.MGF1(hashes.SHA256()), algorithm=hashes.SHA256(), label=None)
+
+
+class ProtocolError(ValueError):
+    """The peer sent something that is not a valid frame."""
+
+
+def frame(kind: int, payload: bytes) -> bytes:
+    return HEADER.pack(len(payload), kind) + payload
+
+
+def dumps(obj) -> bytes:
+    return json.dumps(obj, separators=(',', ':')).encode("utf-8")
+
+
+def load_json(payload):
+    """A JSON payload (bytes or memoryview) -> object."""
+    return json.loads(str(payload, "utf-8"))
+
+
+class FrameDecoder:
+    """
+    Incremental decoder.  Bytes go in with feed() or straight from a
+    socket with recv_from(); complete frames come out of frames() as
+    (type, memoryview) pairs.  A view is only valid until the loop moves
+    on to the next frame, so decode or copy it there.
+
+    The buffer grows to the largest frame seen and is released once it
+    is empty again, so an idle connection holds no buffer at all.
+    """
+
+    def __init__(self, max_payload: int = MAX_PAYLOAD):
+        self.max_payload = max_payload
+        self._buf   = bytearray()
+        self._start = 0                # first unread byte
+        self._end   = 0                # end of the received bytes
+
+    def __len__(self):
+        return self._end - self._start
+
+    def feed(self, data):
+        n = len(data)
+        self._reserve(n)
+        self._buf[self._end:self._end + n] = data
+        self._end += n
+
+    def recv_from(self, sock, size: int = RECV_SIZE) -> int:
+        """recv_into the buffer directly; returns the byte count, 0 at EOF."""
+        self._reserve(size)
+        with memoryview(self._buf) as view:
+            n = sock.recv_into(view[self._end:self._end + size])
+        self._end += n
+        return n
+
+    def frames(self):
+        buf = self._buf
+        while self._end - self._start >= HEADER.size:
+            length, kind = HEADER.unpack_from(buf, self._start)
+            if length > self.max_payload:
+                raise ProtocolError(f"frame of {length} bytes (limit {self.max_payload})")
+            body = self._start + HEADER.size
+            if self._end - body < length:
+                self._reserve(body + length - self._end)      # room for the rest of it
+                break
+            self._start = body + length
+            with memoryview(buf) as view, view[body:body + length] as payload:
+                yield kind, payload
+        if self._start == self._end:
+            self._start = self._end = 0
+            if len(self._buf) >= RECV_SIZE:
+                self._buf = bytearray()                      # drop a big buffer once drained
+
+    def _reserve(self, n):
+        """Make room for *n* more bytes after _end."""
+        if len(self._buf) - self._end >= n:
+            return
+        pending = self._end - self._start
+        if self._start:                                      # move the unread tail to the front
+            self._buf[:pending] = self._buf[self._start:self._end]
+            self._start, self._end = 0, pending
+        if len(self._buf) - self._end < n:
+            self._buf.extend(bytes(max(n - (len(self._buf) - self._end), len(self._buf))))
+
+
+class Session:
+    """
+    AES-256-GCM for one connection.  Nonces are not sent: each side
+    counts the frames it seals, and the count plus a direction byte is
+    the nonce, so a replayed, dropped or reordered frame fails to open.
+    seal() must be called in the order the frames go on the wire.
+    """
+
+    def __init__(self, key: bytes, sending: bytes, receiving: bytes):
+        self._aead = AESGCM(key)
+        self._sending, self._receiving = sending, receiving
+        self._sent = self._received = 0
+
+    @classmethod
+    def client(cls, key: bytes):
+        return cls(key, b"C", b"S")
+
+    @classmethod
+    def server(cls, key: bytes):
+        return cls(key, b"S", b"C")
+
+    @staticmethod
+    def new_key() -> bytes:
+        return AESGCM.generate_key(bit_length=256)
+
+    def seal(self, data: bytes) -> bytes:
+        nonce = self._sending + self._sent.to_bytes(11, "big")
+        self._sent += 1
+        return self._aead.encrypt(nonce, data, None)
+
+    def open(self, payload) -> bytes:
+        nonce = self._receiving + self._received.to_bytes(11, "big")
+        try:
+            data = self._aead.decrypt(nonce, payload, None)
+        except InvalidTag:
+            raise ProtocolError("sealed frame failed authentication") from None
+        self._received += 1
+        return data
+
+
+class Channel:
+    """
+    The client's connection to the server, passed from page to page as
+    "client".  Messages that arrive before a page asks for them wait in
+    the channel, so switching pages never loses one.
+    """
+
+    def __init__(self, sock: socket.socket, server_key=None):
+        self.sock       = sock
+        self.server_key = server_key   # RSA public key, used for the handshake only
+        self.session: Session | None = None     # None sends plain JSON
+        self.closed     = False
+        self._decoder   = FrameDecoder()
+        self._inbox     = deque()
+        self._send_lock = threading.Lock()
+        self._recv_lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, host: str, port: int, timeout: float | None = None):
+        """
+        Connect, read the server's public key -- the first frame it
+        sends -- and send it a new session key encrypted with it.
+        """
+        sock = socket.create_connection((host, port), timeout)
+        sock.settimeout(None)
+        channel = cls(sock)
+        kind, pem = channel._next_frame()
+        if kind != PUBKEY:
+            sock.close()
+            raise ProtocolError(f"expected the server key, got a type {kind} frame")
+        channel.server_key = serialization.load_pem_public_key(pem)
+
+        key = Session.new_key()
+        sock.sendall(frame(SESSION, channel.server_key.encrypt(key, OAEP)))
+        channel.session = Session.client(key)
+        return channel
+
+    # ── sending ───────────────────────────────────────────────────
+    def send_json(self, obj) -> bool:
+        """Send *obj*, sealed once a session is set up; False if the socket is gone."""
+        payload = dumps(obj)
+        try:
+            with self._send_lock:                  # nonces must follow the wire order
+                if self.session is not None:
+                    packet = frame(SEALED, self.session.seal(payload))
+                else:
+                    packet = frame(JSON, payload)
+                self.sock.sendall(packet)
+            return True
+        except OSError:
+            return False
+
+    # ── receiving ─────────────────────────────────────────────────
+    def recv_json(self, timeout: float | None = None):
+        """The next message; waits up to *timeout* (None = forever).  None on timeout or EOF."""
+        with self._recv_lock:
+            self._drain()
+            while not self._inbox:
+                if self.closed or not self._fill(timeout):
+                    return None
+            return self._inbox.popleft()
+
+    def poll(self) -> list:
+        """Every message that has arrived, without waiting."""
+        with self._recv_lock:
+            self._drain()
+            while not self.closed and self._fill(0):
+                pass
+            out = list(self._inbox)
+            self._inbox.clear()
+            return out
+
+    def _fill(self, timeout) -> bool:
+        """One recv into the decoder if data comes within *timeout*; False if none or EOF."""
+        if timeout is not None:
+            ready, _, _ = select.select([self.sock], [], [], timeout)
+            if not ready:
+                return False
+        try:
+            n = self._decoder.recv_from(self.sock)
+        except (BlockingIOError, InterruptedError):
+            return False
+        except OSError:
+            n = 0
+        if n == 0:
+            self.closed = True
+            return False
+        self._drain()
+        return True
+
+    def _drain(self):
+        try:
+            for kind, payload in self._decoder.frames():
+                if kind == SEALED and self.session is not None:
+                    self._inbox.append(load_json(self.session.open(payload)))
+                elif kind == JSON:
+                    self._inbox.append(load_json(payload))
+        except ProtocolError:
+            self.close()                           # no way to resynchronise after this
+
+    def _next_frame(self):
+        """(type, bytes) of the next frame of any type; only used before login."""
+        while True:
+            for kind, payload in self._decoder.frames():
+                return kind, bytes(payload)           # later frames stay buffered
+            if self._decoder.recv_from(self.sock) == 0:
+                raise ConnectionError("server closed the connection")
+
+    def close(self):
+        self.closed = True
+        try:
+            self.sock.close()
+        except OSError:
+            pass
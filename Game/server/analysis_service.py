@@ -0,0 +1,215 @@
+"""
+Shared engine analysis for every client of the server.
+
+Clients send "analyse_position" / "analyse_game" and the positions go on
+a job queue that lives in SQLite, so jobs survive a server restart.  The
+queue holds each position once: however many players ask about the
+same opening, it is searched by one of the worker threads -- each keeping
+one pooled engine process busy -- and every asker gets the result.
+Finished positions land in the analysis cache, so repeats are answered
+at once, and a game's plies stream back one by one as they complete.
+"""
+import logging
+import os
+import sqlite3
+import threading
+
+import chess
+
+from ChessEngine import ChessEngine
+from analysis_cache import position_key
+from batch_analysis import grade, to_uci, MATE_CP
+
+JOBS_DB         = "analysis_jobs.db"
+SERVICE_MULTIPV = 3           # lines per position; a request may ask for fewer
+STOCKFISH       = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "..", "stockfish", "stockfish.exe")
+
+
+def lines_to_json(board, lines):
+    """Engine lines -> JSON-ready dicts, scores from White's side."""
+    out = []
+    for info in lines:
+        white = info["score"].white()
+        pv = info.get("pv", [])
+        out.append({"eval_cp": white.score(mate_score=MATE_CP), "mate": white.mate(),
+                    "best": board.san(pv[0]) if pv else None,
+                    "pv": [move.uci() for move in pv], "depth": info.get("depth")})
+    return out
+
+
+class AnalysisService:
+    def __init__(self, stockfish_path=STOCKFISH, workers=None, depth=18, jobs_db=JOBS_DB):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.engine  = ChessEngine(stockfish_path, depth=depth, pool_size=self.workers)
+        self._db     = sqlite3.connect(jobs_db, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id       INTEGER PRIMARY KEY AUTOINCREMENT,   -- queue order
+                position TEXT NOT NULL UNIQUE,                -- position_key(), one job each
+                fen      TEXT NOT NULL
+            );
+            """)
+        self._db.commit()
+
+        self._cond     = threading.Condition()
+        self._queue    = {}        # position -> fen, in queue order, not yet taken
+        self._waiting  = {}        # position -> [(owner, board, callback), ...]
+        self._busy     = set()     # positions a worker is searching right now
+        self._running  = True
+        for position, fen in self._db.execute("SELECT position, fen FROM jobs ORDER BY id"):
+            self._queue[position] = fen                       # left over from last run
+
+        for n in range(self.workers):
+            threading.Thread(target=self._worker, name=f"analysis-{n}", daemon=True).start()
+
+    # ── requests ──────────────────────────────────────────────────
+    def analyse_position(self, owner, fen, deliver, multipv=1, request_id=None):
+        """deliver(packet) once with the lines for *fen*."""
+        board = chess.Board(fen)
+        multipv = max(1, min(multipv, SERVICE_MULTIPV))
+
+        def done(lines):
+            if lines is None:
+                deliver({"type": "analysis_error", "request_id": request_id, "fen": fen})
+                return
+            deliver({"type": "analysis_result", "request_id": request_id, "fen": fen,
+                     "lines": lines_to_json(board, lines[:multipv])})
+
+        self.submit(owner, board, done)
+
+    def analyse_game(self, owner, moves, deliver, fen=chess.STARTING_FEN, request_id=None):
+        """
+        deliver(packet) for every ply as soon as the positions before and
+        after it are both analysed, in whatever order that happens, then a
+        final "analysis_done" with each side's average centipawn loss.
+        """
+        moves = to_uci(chess.Board(fen), moves)
+        boards = [chess.Board(fen)]
+        for uci in moves:
+            boards.append(boards[-1].copy(stack=False))
+            boards[-1].push_uci(uci)
+        n = len(moves)
+        infos, sent, loss = [None] * (n + 1), set(), {chess.WHITE: [], chess.BLACK: []}
+        failed = []
+        lock = threading.Lock()
+
+        def finished(i, lines):
+            packets = []
+            with lock:
+                if lines is None:
+                    if not failed:                      # one error per game is enough
+                        failed.append(i)
+                        packets.append({"type": "analysis_error", "request_id": request_id,
+                                        "ply": i})
+                else:
+                    infos[i] = lines[0]
+                for ply in (i - 1, i):
+                    if 0 <= ply < n and ply not in sent and infos[ply] and infos[ply + 1]:
+                        sent.add(ply)
+                        packets.append(self._ply_packet(boards[ply], moves[ply], infos, ply,
+                                                        loss, request_id))
+                if packets and not failed and len(sent) == n:
+                    packets.append(self._done_packet(loss, n, request_id))
+            for packet in packets:
+                deliver(packet)
+
+        if n == 0:
+            deliver(self._done_packet(loss, 0, request_id))
+        self.submit_many(owner, [(board, lambda lines, i=i: finished(i, lines))
+                                 for i, board in enumerate(boards)])
+
+    def submit(self, owner, board, callback):
+        """
+        callback(lines) once *board* is analysed: at once if the tablebase
+        or the cache knows it, otherwise when a worker has searched it, and
+        callback(None) if the search failed.  The position is queued only
+        if nobody queued it already.
+        """
+        self.submit_many(owner, [(board, callback)])
+
+    def submit_many(self, owner, requests):
+        """
+        submit() for every (board, callback) in *requests*, with the new
+        jobs stored in one transaction.  The lookups and the commit block,
+        so the server calls this from its DB threads, never its event loop.
+        """
+        unknown = []
+        for board, callback in requests:
+            lines = self.engine.known(board, SERVICE_MULTIPV)
+            if lines is not None:
+                callback(lines)
+            else:
+                unknown.append((position_key(board), board, callback))
+        if not unknown:
+            return
+        with self._cond:
+            jobs = []
+            for key, board, callback in unknown:
+                self._waiting.setdefault(key, []).append((owner, board, callback))
+                if key not in self._queue and key not in self._busy:
+                    self._queue[key] = board.fen()
+                    jobs.append((key, board.fen()))
+            if jobs:
+                with self._db:
+                    self._db.executemany("INSERT OR IGNORE INTO jobs (position, fen) VALUES (?, ?)",
+                                         jobs)
+                self._cond.notify(len(jobs))
+
+    def forget(self, owner):
+        """Drop *owner*'s pending callbacks; the positions stay queued for the cache."""
+        with self._cond:
+            for key, waiters in self._waiting.items():
+                waiters[:] = [w for w in waiters if w[0] is not owner]
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    # ── workers ───────────────────────────────────────────────────
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                key = next(iter(self._queue))
+                fen = self._queue.pop(key)
+                self._busy.add(key)
+
+            board = chess.Board(fen)
+            try:
+                lines = self.engine.analyse_many([board], SERVICE_MULTIPV)[0]
+            except Exception as e:
+                logging.error(f"analysis of {fen} failed: {e}")
+                lines = None
+
+            with self._cond:
+                waiters = self._waiting.pop(key, [])
+                self._busy.discard(key)
+                self._db.execute("DELETE FROM jobs WHERE position = ?", (key,))
+                self._db.commit()
+            for _, board, callback in waiters:
+                try:
+                    callback(lines)
+                except Exception as e:
+                    logging.error(f"analysis callback failed: {e}")
+
+    # ── packets ───────────────────────────────────────────────────
+    @staticmethod
+    def _ply_packet(board, uci, infos, ply, loss, request_id):
+        move = chess.Move.from_uci(uci)
+        cpl, tag = grade(board, move, infos[ply], infos[ply + 1])
+        loss[board.turn].append(cpl)
+        line = lines_to_json(board, [infos[ply]])[0]
+        return {"type": "analysis_ply", "request_id": request_id, "ply": ply + 1,
+                "move": move.uci(), "san": board.san(move), "best": line["best"],
+                "eval_cp": line["eval_cp"], "mate": line["mate"], "cpl": cpl, "tag": tag}
+
+    @staticmethod
+    def _done_packet(loss, plies, request_id):
+        acpl = lambda side: round(sum(loss[side]) / len(loss[side]), 1) if loss[side] else None
+        return {"type": "analysis_done", "request_id": request_id, "plies": plies,
+                "acpl_white": acpl(chess.WHITE), "acpl_black": acpl(chess.BLACK)}
@@ -0,0 +1,96 @@
+"""
+Syzygy endgame tablebases in front of the engine.
+
+Positions with few enough pieces are answered exactly from a local
+Syzygy directory through chess.syzygy: WDL says who wins, DTZ how to make
+progress, and ranking every legal move by them gives the best move
+without starting a search.  Without a directory every probe misses and
+the engine searches as before.
+"""
+import os
+import threading
+
+import chess
+import chess.engine
+import chess.syzygy
+
+SYZYGY_DIR = "syzygy"
+TB_WIN     = 20000        # centipawns for a tablebase win, less the moves it takes
+
+
+class Tablebase:
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, directory: str = SYZYGY_DIR):
+        self.directory  = directory
+        self.max_pieces = 0
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        self._tb   = None
+        if os.path.isdir(directory):
+            # KRPvKR.rtbw -> 5 pieces; the largest set present is the limit
+            sizes = [len(name.split(".")[0].replace("v", ""))
+                     for name in os.listdir(directory) if name.endswith((".rtbw", ".rtbz"))]
+            if sizes:
+                self._tb = chess.syzygy.open_tablebase(directory)
+                self.max_pieces = max(sizes)
+
+    @classmethod
+    def shared(cls, directory: str = SYZYGY_DIR):
+        with cls._shared_lock:
+            if directory not in cls._shared:
+                cls._shared[directory] = cls(directory)
+            return cls._shared[directory]
+
+    def __bool__(self):
+        return self._tb is not None
+
+    def covers(self, board: chess.Board) -> bool:
+        return (self._tb is not None and not board.castling_rights
+                and chess.popcount(board.occupied) <= self.max_pieces)
+
+    def probe(self, board: chess.Board, multipv: int = 1):
+        """
+        The best *multipv* moves as engine.analyse() style info dicts, with
+        exact scores and "tablebase": wdl added, or None when *board* is
+        not in the tables.  A finished game has no moves and gives None.
+        """
+        if not self.covers(board) or board.is_game_over():
+            return None
+        board = board.copy(stack=False)
+        try:
+            with self._lock:
+                ranked = sorted((self._rank(board, move) for move in list(board.legal_moves)),
+                                key=lambda r: r[0], reverse=True)
+        except (KeyError, chess.syzygy.MissingTableError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [{"score": chess.engine.PovScore(chess.engine.Cp(cp), board.turn),
+                 "pv": [move], "tablebase": wdl}
+                for _, cp, wdl, move in ranked[:multipv]]
+
+    def _rank(self, board, move):
+        """(sort key, centipawns, wdl, move) for *move*, from the mover's side."""
+        board.push(move)
+        try:
+            if board.is_checkmate():
+                wdl, dtz = 2, 0
+            else:
+                wdl = -self._tb.probe_wdl(board)
+                dtz = abs(self._tb.probe_dtz(board))
+        finally:
+            board.pop()
+        if wdl == 2:
+            key, cp = (2, -dtz), TB_WIN - dtz        # quickest win first
+        elif wdl == -2:
+            key, cp = (-2, dtz), -TB_WIN + dtz       # slowest loss first
+        else:
+            key, cp = (wdl, 0), 0                    # cursed wins and blessed losses are draws
+        return key, cp, wdl, move
+
+    def close(self):
+        if self._tb is not None:
+            self._tb.close()
+            self._tb = None
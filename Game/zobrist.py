@@ -0,0 +1,33 @@
+"""
+64-bit Zobrist keys for ChessBoard positions.
+
+The random numbers are the Polyglot ones shipped with python-chess, so a
+ChessBoard key is identical to chess.polyglot.zobrist_hash() of the same
+position and can be looked up straight in a Polyglot opening book.
+"""
+import chess
+import chess.polyglot
+from chess.polyglot import POLYGLOT_RANDOM_ARRAY as _RANDOM
+from bitboard import WHITE, BLACK
+
+# PIECE_KEYS[colour][piece type][square]; Polyglot orders black before white
+PIECE_KEYS = [[[_RANDOM[64 * (2 * kind + (color == WHITE)) + sq] for sq in range(64)]
+               for kind in range(6)]
+              for color in (WHITE, BLACK)]
+
+# indexed by ChessBoard's K=1 Q=2 k=4 q=8 castling mask
+CASTLING_KEYS = []
+for _mask in range(16):
+    _key = 0
+    for _i in range(4):
+        if _mask >> _i & 1:
+            _key ^= _RANDOM[768 + _i]
+    CASTLING_KEYS.append(_key)
+
+EP_KEYS  = [_RANDOM[772 + file] for file in range(8)]
+TURN_KEY = _RANDOM[780]          # xored in when White is to move
+
+
+def fen_key(fen: str) -> int:
+    """Key of a FEN string, equal to ChessBoard.zobrist_key for that position."""
+    return chess.polyglot.zobrist_hash(chess.Board(fen))
@@ -1,15 +1,15 @@
-@echo off
-echo Installing required Python packages...
-
-pip install customtkinter
-pip install CTkMessagebox
-pip install Pillow
-pip install cryptography
-pip install rsa
-pip install pygame
-pip install chess
-pip install termcolor
-
-echo.
-echo All packages installed successfully!
-pause
+@echo off
+echo Installing required Python packages...
+
+pip install customtkinter
+pip install CTkMessagebox
+pip install Pillow
+pip install cryptography
+pip install rsa
+pip install pygame
+pip install chess
+pip install termcolor
+
+echo.
+echo All packages installed successfully!
+pause